@@ -1,4 +1,6 @@
 import logging
+from collections.abc import Mapping
+from typing import Any
 
 from homeassistant.const import Platform
 from homeassistant.components import network
@@ -9,14 +11,33 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    CONF_ACKED_DELIVERY,
+    CONF_BATCH_DELIVERY,
+    CONF_BATCH_WINDOW_MS,
+    CONF_BULK_RECEIVE,
+    CONF_COMMAND_INTERVAL_MS,
+    CONF_COMMAND_WINDOW_MS,
+    CONF_GATEWAY_FEATURES,
     CONF_GATEWAY_HW_VERSION,
     CONF_GATEWAY_IP,
     CONF_GATEWAY_MAC,
+    CONF_GATEWAY_RATE,
     CONF_GATEWAY_TYPE,
     CONF_LOCAL_BIND_IP,
+    CONF_RECEIVE_BUFFER_KB,
+    CONF_RECEIVE_THREAD,
+    CONF_SOURCE_FILTER,
+    CONF_SOURCE_LEARNING,
+    DEFAULT_BATCH_WINDOW_MS,
+    DEFAULT_COMMAND_INTERVAL_MS,
+    DEFAULT_COMMAND_WINDOW_MS,
+    DEFAULT_GATEWAY_RATE,
     DOMAIN,
+    LISTENER_OPTIONS,
     SIGNAL_JOIN_WINDOW,
 )
+from .cache import DeviceCache
+from .messages import JoinWindowMessage
 from .udp import UDPListener
 
 PLATFORMS = [Platform.LIGHT, Platform.COVER, Platform.BUTTON]
@@ -30,8 +51,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hass.data[DOMAIN].setdefault("join_window_handlers", {})
 
     bind_ip = entry.options.get(CONF_LOCAL_BIND_IP) or entry.data.get(CONF_LOCAL_BIND_IP, "")
+    adapters = await network.async_get_adapters(hass)
     if not bind_ip:
-        adapters = await network.async_get_adapters(hass)
         for adapter in adapters:
             adapter_type = (
                 adapter.get("type") if isinstance(adapter, dict) else getattr(adapter, "type", None)
@@ -55,28 +76,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if bind_ip:
             _LOGGER.debug("Auto-selected wired bind IP %s for UDP", bind_ip)
 
-    if "udp_listener" not in hass.data[DOMAIN]:
-        if bind_ip:
-            hass.data[DOMAIN][CONF_LOCAL_BIND_IP] = bind_ip
-        listener = UDPListener(hass, bind_ip=bind_ip)
-        await listener.async_start()
+    settings = _listener_settings(entry.options)
+    listener: UDPListener | None = hass.data[DOMAIN].get("udp_listener")
+    if listener is not None and hass.data[DOMAIN]["udp_listener_settings"] != settings:
+        # One listener serves every entry. An entry set up with other listener
+        # options (they were just changed on it) rebuilds it, and the other
+        # entries take the same options so the next start agrees.
+        registrations = listener.registrations()
+        await listener.async_stop()
+        listener = UDPListener(hass, **settings)
+        for other_id, other_ip, other_interface in registrations:
+            await listener.async_add_entry(other_id, other_ip, other_interface)
         hass.data[DOMAIN]["udp_listener"] = listener
-    elif bind_ip and hass.data[DOMAIN].get(CONF_LOCAL_BIND_IP) not in ("", bind_ip):
-        _LOGGER.warning(
-            "UDP listener already running on %s; requested bind IP %s will be ignored until restart",
-            hass.data[DOMAIN].get(CONF_LOCAL_BIND_IP),
-            bind_ip,
-        )
-        hass.data[DOMAIN][CONF_LOCAL_BIND_IP] = bind_ip
-    elif bind_ip and CONF_LOCAL_BIND_IP not in hass.data[DOMAIN]:
-        hass.data[DOMAIN][CONF_LOCAL_BIND_IP] = bind_ip
+        hass.data[DOMAIN]["udp_listener_settings"] = settings
+        _share_listener_options(hass, entry)
+    elif listener is None:
+        listener = UDPListener(hass, **settings)
+        hass.data[DOMAIN]["udp_listener"] = listener
+        hass.data[DOMAIN]["udp_listener_settings"] = settings
+    await listener.async_add_entry(
+        entry.entry_id, bind_ip, _interface_for_ip(adapters, bind_ip)
+    )
+
+    cache = DeviceCache(hass, entry.entry_id)
+    await cache.async_load()
 
     hass.data[DOMAIN][entry.entry_id] = {
         CONF_GATEWAY_MAC: entry.data.get(CONF_GATEWAY_MAC),
         CONF_GATEWAY_IP: entry.data.get(CONF_GATEWAY_IP),
         CONF_GATEWAY_TYPE: entry.data.get(CONF_GATEWAY_TYPE),
         CONF_GATEWAY_HW_VERSION: entry.data.get(CONF_GATEWAY_HW_VERSION),
+        CONF_GATEWAY_FEATURES: frozenset(entry.data.get(CONF_GATEWAY_FEATURES) or ()),
+        CONF_LOCAL_BIND_IP: bind_ip,
+        "device_cache": cache,
+        "options": _entry_options(entry.options),
     }
+    listener.refresh_gateways()
 
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
@@ -92,20 +127,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     @callback
-    def _handle_join_window(payload):
-        gw_mac = payload.get("mac") or entry.data.get(CONF_GATEWAY_MAC)
-        duration = payload.get("duration_s")
+    def _handle_join_window(message: JoinWindowMessage):
+        gw_mac = message.gateway_mac or entry.data.get(CONF_GATEWAY_MAC)
+        duration = message.data.get("duration_s")
         if not gw_mac:
             return
-        message = f"Join window opened on gateway {gw_mac}"
+        text = f"Join window opened on gateway {gw_mac}"
         if duration:
-            message += f" for {duration}s"
+            text += f" for {duration}s"
         hass.async_create_task(
             hass.services.async_call(
                 "persistent_notification",
                 "create",
                 {
-                    "message": message,
+                    "message": text,
                     "title": "Gateway Join Window",
                     "notification_id": f"join_window_{gw_mac}",
                 },
@@ -115,29 +150,96 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     remove = async_dispatcher_connect(hass, SIGNAL_JOIN_WINDOW, _handle_join_window)
     hass.data[DOMAIN]["join_window_handlers"][entry.entry_id] = remove
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
     return True
 
+def _listener_settings(options: Mapping[str, Any]) -> dict[str, Any]:
+    batch_window = None
+    if options.get(CONF_BATCH_DELIVERY):
+        batch_window = options.get(CONF_BATCH_WINDOW_MS, DEFAULT_BATCH_WINDOW_MS) / 1000
+    return {
+        "batch_window": batch_window,
+        "source_filter": options.get(CONF_SOURCE_FILTER, False),
+        "source_learning": options.get(CONF_SOURCE_LEARNING, False),
+        "bulk_receive": options.get(CONF_BULK_RECEIVE, False),
+        "receive_buffer": options.get(CONF_RECEIVE_BUFFER_KB, 0) * 1024,
+        "receive_thread": options.get(CONF_RECEIVE_THREAD, False),
+        "command_window": options.get(CONF_COMMAND_WINDOW_MS, DEFAULT_COMMAND_WINDOW_MS) / 1000,
+        "acked_delivery": options.get(CONF_ACKED_DELIVERY, False),
+        "command_interval": (
+            options.get(CONF_COMMAND_INTERVAL_MS, DEFAULT_COMMAND_INTERVAL_MS) / 1000
+        ),
+        "gateway_rate": options.get(CONF_GATEWAY_RATE, DEFAULT_GATEWAY_RATE),
+    }
+
+
+def _entry_options(options: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in options.items() if key not in LISTENER_OPTIONS}
+
+
+def _share_listener_options(hass: HomeAssistant, source: ConfigEntry) -> None:
+    shared = {key: source.options[key] for key in LISTENER_OPTIONS if key in source.options}
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id == source.entry_id:
+            continue
+        options = {**_entry_options(other.options), **shared}
+        if options != other.options:
+            hass.config_entries.async_update_entry(other, options=options)
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Listener settings and light groups are applied when the entry is set up.
+    # Data-only updates (a learned gateway IP reloads the entry itself) and
+    # listener options copied from another entry need no reload.
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if (
+        entry_data is not None
+        and entry_data["options"] == _entry_options(entry.options)
+        and hass.data[DOMAIN].get("udp_listener_settings") == _listener_settings(entry.options)
+    ):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    entry_keys = [
-        key
-        for key in hass.data[DOMAIN]
-        if key not in ("udp_listener", "light_manager", "cover_manager")
-    ]
-
-    if not entry_keys:
-        listener: UDPListener | None = hass.data[DOMAIN].pop("udp_listener", None)
-        if listener:
-            await listener.async_stop()
-        hass.data[DOMAIN].pop(CONF_LOCAL_BIND_IP, None)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # A reload loads the cache again right away; it must see the latest state.
+        await entry_data["device_cache"].async_flush()
+
+        listener: UDPListener | None = hass.data[DOMAIN].get("udp_listener")
+        if listener is not None:
+            if await listener.async_remove_entry(entry.entry_id):
+                await listener.async_stop()
+                hass.data[DOMAIN].pop("udp_listener")
+                hass.data[DOMAIN].pop("udp_listener_settings")
+            else:
+                listener.refresh_gateways()
 
     remover = hass.data[DOMAIN].get("join_window_handlers", {}).pop(entry.entry_id, None)
     if remover:
         remover()
 
     return unload_ok
+
+
+def _interface_for_ip(adapters, bind_ip: str) -> str | None:
+    """Return the name of the network adapter that owns ``bind_ip``."""
+    if not bind_ip:
+        return None
+    for adapter in adapters:
+        ipv4_list = (
+            adapter.get("ipv4") if isinstance(adapter, dict) else getattr(adapter, "ipv4", None)
+        )
+        for addr in ipv4_list or ():
+            address = (
+                addr.get("address") if isinstance(addr, dict) else getattr(addr, "address", None)
+            )
+            if address == bind_ip:
+                return adapter.get("name") if isinstance(adapter, dict) else getattr(adapter, "name", None)
+    return None
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await DeviceCache(hass, entry.entry_id).async_remove()
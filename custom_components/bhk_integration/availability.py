@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, GATEWAY_ALIVE_TIMEOUT, SIGNAL_GATEWAY_ALIVE
+from .gateways import normalize_mac
+from .messages import GatewayAliveMessage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_availability(hass: HomeAssistant) -> GatewayAvailability:
+    availability: GatewayAvailability | None = hass.data[DOMAIN].get("availability")
+    if availability is None:
+        availability = hass.data[DOMAIN]["availability"] = GatewayAvailability(hass)
+    return availability
+
+
+class GatewayAvailability:
+    """Per-gateway gateway_alive deadlines on the event loop's monotonic clock.
+
+    A heartbeat only moves its gateway's deadline forward. The gateway's
+    single timer is armed by the first heartbeat and, when it fires before
+    the current deadline, re-armed for the time left; so steady heartbeats
+    schedule nothing new, and a gateway is reported offline exactly
+    GATEWAY_ALIVE_TIMEOUT seconds after its last heartbeat. Listeners are
+    only called when a gateway goes offline or comes back.
+    """
+
+    def __init__(self, hass: HomeAssistant, timeout: float = GATEWAY_ALIVE_TIMEOUT) -> None:
+        self._hass = hass
+        self._loop = hass.loop
+        self._timeout = timeout
+        self._deadlines: dict[str, float] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._offline: set[str] = set()
+        self._listeners: list[Callable[[str, bool], None]] = []
+        self.expired = 0
+        self._remove_alive = async_dispatcher_connect(
+            hass, SIGNAL_GATEWAY_ALIVE, self._handle_gateway_alive
+        )
+
+    def add_listener(self, listener: Callable[[str, bool], None]) -> Callable[[], None]:
+        """Call ``listener(gateway, available)`` on changes; gateway is a normalized MAC."""
+
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            self._listeners.remove(listener)
+            if not self._listeners:
+                self._stop()
+
+        return remove
+
+    def is_available(self, gateway: str) -> bool:
+        return gateway not in self._offline
+
+    @callback
+    def _handle_gateway_alive(self, message: GatewayAliveMessage) -> None:
+        if not message.gateway_mac:
+            return
+        gateway = normalize_mac(message.gateway_mac)
+        self._deadlines[gateway] = self._loop.time() + self._timeout
+        if gateway not in self._timers:
+            self._timers[gateway] = self._loop.call_later(self._timeout, self._expire, gateway)
+        if gateway in self._offline:
+            self._offline.discard(gateway)
+            _LOGGER.info("Gateway %s is alive again", gateway)
+            self._notify(gateway, True)
+
+    def _expire(self, gateway: str) -> None:
+        remaining = self._deadlines[gateway] - self._loop.time()
+        if remaining > 0:
+            self._timers[gateway] = self._loop.call_later(remaining, self._expire, gateway)
+            return
+        del self._timers[gateway]
+        self._offline.add(gateway)
+        self.expired += 1
+        _LOGGER.info(
+            "No gateway_alive from %s for %ss; marking its devices unavailable",
+            gateway,
+            self._timeout,
+        )
+        self._notify(gateway, False)
+
+    def _notify(self, gateway: str, available: bool) -> None:
+        for listener in list(self._listeners):
+            listener(gateway, available)
+
+    def _stop(self) -> None:
+        self._remove_alive()
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._hass.data[DOMAIN].pop("availability", None)
+
+    def as_dict(self) -> dict[str, Any]:
+        now = self._loop.time()
+        return {
+            "timeout": self._timeout,
+            "gateways": {
+                gateway: {
+                    "available": gateway not in self._offline,
+                    "deadline_in": round(deadline - now, 1),
+                }
+                for gateway, deadline in self._deadlines.items()
+            },
+            "expired": self.expired,
+        }
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import ENTITY_ADD_WINDOW_SECONDS
+
+
+class EntityBatcher:
+    """Collect new entities of one config entry and add them together.
+
+    A 3Lights join, a gateway replaying its registrations or a join window
+    admitting many devices would otherwise cost one entity-platform round
+    trip per entity. Until the batch is flushed an entity has no ``hass``:
+    state applied to it meanwhile is written when it is added.
+    """
+
+    def __init__(self, hass: HomeAssistant, async_add_entities: AddEntitiesCallback) -> None:
+        self._hass = hass
+        self._async_add_entities = async_add_entities
+        self._pending: list[Any] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self.added = 0
+        self.batches = 0
+
+    def add(self, entity: Any) -> None:
+        self._pending.append(entity)
+        if self._handle is None:
+            self._handle = self._hass.loop.call_later(ENTITY_ADD_WINDOW_SECONDS, self.flush)
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            self.added += len(pending)
+            self.batches += 1
+            self._async_add_entities(pending)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
+
+
+class StateWriteThrottle:
+    """At most one state write per entity and interval; the last value always lands.
+
+    A write requested too soon after the previous one is deferred to the end
+    of the interval and then writes whatever state the entity has by then,
+    so every request in between is saved. Immediate writes (terminal states,
+    availability) go out at once and replace a deferred one.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loop = loop
+        self._interval = interval
+        self._clock = clock
+        self._last_write: dict[str, float] = {}
+        self._pending: dict[str, asyncio.TimerHandle] = {}
+        self.written = 0
+        self.saved = 0
+
+    def write(self, entity: Entity, immediate: bool = False) -> None:
+        if entity.hass is None:
+            # Not added yet: the state is written when the entity is added.
+            return
+        key = entity.unique_id
+        if immediate or self._interval <= 0:
+            if handle := self._pending.pop(key, None):
+                handle.cancel()
+            self._write(key, entity)
+            return
+        if key in self._pending:
+            self.saved += 1
+            return
+        wait = self._interval - (self._clock() - self._last_write.get(key, -self._interval))
+        if wait <= 0:
+            self._write(key, entity)
+            return
+        self._pending[key] = self._loop.call_later(wait, self._flush, key, entity)
+
+    def _flush(self, key: str, entity: Entity) -> None:
+        del self._pending[key]
+        if entity.hass is not None:
+            self._write(key, entity)
+
+    def _write(self, key: str, entity: Entity) -> None:
+        self._last_write[key] = self._clock()
+        self.written += 1
+        entity.async_write_ha_state()
+
+    def cancel(self) -> None:
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "interval": self._interval,
+            "written": self.written,
+            "saved": self.saved,
+            "pending": len(self._pending),
+        }
@@ -16,6 +16,7 @@ from .const import (
     CONF_GATEWAY_TYPE,
     DEFAULT_JOIN_WINDOW_SECONDS,
     DOMAIN,
+    PRIORITY_BACKGROUND,
 )
 from .udp import async_send_udp_command
 
@@ -68,4 +69,6 @@ class BHKOpenJoinButton(ButtonEntity):
         _LOGGER.info(
             "Sending open_join to %s for %ss", self._gateway_ip, DEFAULT_JOIN_WINDOW_SECONDS
         )
-        await async_send_udp_command(self.hass, self._gateway_ip, payload)
+        await async_send_udp_command(
+            self.hass, self._gateway_ip, payload, priority=PRIORITY_BACKGROUND
+        )
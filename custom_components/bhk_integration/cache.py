@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DEVICE_CACHE_SAVE_DELAY, DEVICE_CACHE_VERSION, DOMAIN
+
+
+class CachedEntity(Protocol):
+    unique_id: str | None
+
+    def as_cache_record(self) -> dict[str, Any]: ...
+
+
+class DeviceCache:
+    """Devices of one config entry persisted across restarts.
+
+    Records are kept per platform ("light", "cover") and unique_id, in the
+    shape of the register message that created the entity, so the managers
+    can recreate every entity as soon as the entry is set up. Changed
+    entities are only remembered; their records are built and written
+    together by Store's delayed save, armed once by the first change after
+    a write so steady reports do not keep pushing it back.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, DEVICE_CACHE_VERSION, f"{DOMAIN}.{entry_id}.devices"
+        )
+        self._data: dict[str, dict[str, dict[str, Any]]] = {}
+        self._dirty: dict[tuple[str, str], CachedEntity] = {}
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    def records(self, platform: str) -> dict[str, dict[str, Any]]:
+        return self._data.get(platform, {})
+
+    def remember(self, platform: str, entity: CachedEntity) -> None:
+        key = (platform, entity.unique_id)
+        if not entity.unique_id or key in self._dirty:
+            return
+        if self._data.get(platform, {}).get(entity.unique_id) == entity.as_cache_record():
+            return
+        if not self._dirty:
+            self._store.async_delay_save(self._data_to_save, DEVICE_CACHE_SAVE_DELAY)
+        self._dirty[key] = entity
+
+    def _data_to_save(self) -> dict[str, dict[str, dict[str, Any]]]:
+        dirty, self._dirty = self._dirty, {}
+        for (platform, unique_id), entity in dirty.items():
+            self._data.setdefault(platform, {})[unique_id] = entity.as_cache_record()
+        return self._data
+
+    async def async_flush(self) -> None:
+        """Write pending changes now, e.g. before the entry is reloaded."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        self._dirty.clear()
+        await self._store.async_remove()
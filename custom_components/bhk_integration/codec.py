@@ -0,0 +1,164 @@
+"""Compact binary framing for gateway messages.
+
+Gateways that advertise ``FEATURE_BINARY`` in their discovery response can
+exchange device messages as binary frames instead of JSON. A frame is::
+
+    magic (2) | version (1) | type (1) | seq (2) | gateway mac (6)
+    id length (1) | device id | endpoint (1) | state length (1) | state
+
+Device ids are the hex strings used in the JSON protocol, sent as raw bytes.
+A ``"<endpoint>_<state>"`` payload is split into its endpoint byte and state;
+payloads without an endpoint (cover reports, ``P:xx``) use endpoint 0. The
+magic is not valid UTF-8, so binary frames and JSON datagrams can share a
+socket and be told apart from the first bytes. A command carries its
+``req_id`` in the sequence field, and a ``cmd_ack`` frame echoes it there.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+FEATURE_BINARY = "bin1"
+
+MAGIC = b"\xb4K"
+VERSION = 1
+
+TYPE_DEVICE_REPORT = 0x01
+TYPE_DEVICE_JOIN = 0x02
+TYPE_GATEWAY_ALIVE = 0x03
+TYPE_DEVICE_CMD = 0x10
+TYPE_COMMAND_ACK = 0x11
+
+_TYPE_NAMES = {
+    TYPE_DEVICE_REPORT: "device_report",
+    TYPE_DEVICE_JOIN: "device_join",
+    TYPE_GATEWAY_ALIVE: "gateway_alive",
+    TYPE_DEVICE_CMD: "device_cmd",
+    TYPE_COMMAND_ACK: "cmd_ack",
+}
+_TYPE_CODES = {name: code for code, name in _TYPE_NAMES.items()}
+
+_HEADER = struct.Struct(">2sBBH6s")
+_NO_MAC = bytes(6)
+
+
+def is_frame(data: bytes) -> bool:
+    return data[:2] == MAGIC
+
+
+def _mac_to_bytes(mac: str | None) -> bytes:
+    if not mac:
+        return _NO_MAC
+    raw = bytes.fromhex(str(mac).replace(":", "").replace("-", ""))
+    if len(raw) != 6:
+        raise ValueError(f"invalid MAC {mac!r}")
+    return raw
+
+
+def _mac_from_bytes(raw: bytes) -> str | None:
+    if raw == _NO_MAC:
+        return None
+    return raw.hex(":").upper()
+
+
+def _split_payload(payload: str) -> tuple[int, str]:
+    endpoint, sep, state = payload.partition("_")
+    if sep and endpoint.isdigit() and 0 < int(endpoint) < 256:
+        return int(endpoint), state
+    return 0, payload
+
+
+def encode_frame(
+    msg_type: str,
+    device_id: str | None = None,
+    payload: str = "",
+    gateway_mac: str | None = None,
+    seq: int = 0,
+) -> bytes:
+    """Build a binary frame; raise ValueError if the message cannot be framed."""
+
+    code = _TYPE_CODES.get(msg_type)
+    if code is None:
+        raise ValueError(f"message type {msg_type!r} has no binary encoding")
+    device = bytes.fromhex(device_id) if device_id else b""
+    if code in (TYPE_DEVICE_REPORT, TYPE_DEVICE_CMD):
+        endpoint, state = _split_payload(payload)
+    else:
+        endpoint, state = 0, payload
+    state_bytes = state.encode()
+    if len(device) > 255 or len(state_bytes) > 255:
+        raise ValueError("device id or state too long for a binary frame")
+    return b"".join(
+        (
+            _HEADER.pack(MAGIC, VERSION, code, seq & 0xFFFF, _mac_to_bytes(gateway_mac)),
+            bytes((len(device),)),
+            device,
+            bytes((endpoint, len(state_bytes))),
+            state_bytes,
+        )
+    )
+
+
+def decode_frame(data: bytes) -> dict[str, Any] | None:
+    """Decode a binary frame into the normalized dict a JSON datagram would give."""
+
+    try:
+        magic, version, code, seq, mac = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        offset = _HEADER.size
+        id_len = data[offset]
+        offset += 1
+        device = data[offset : offset + id_len]
+        offset += id_len
+        endpoint = data[offset]
+        state_len = data[offset + 1]
+        offset += 2
+        state_bytes = data[offset : offset + state_len]
+        if len(device) != id_len or len(state_bytes) != state_len:
+            return None
+        state = state_bytes.decode()
+    except (struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+    msg_type = _TYPE_NAMES.get(code)
+    if msg_type is None:
+        return None
+    payload = f"{endpoint}_{state}" if endpoint else state
+    device_id = device.hex().upper() if device else None
+    gateway_mac = _mac_from_bytes(mac)
+
+    result: dict[str, Any] = {"type": msg_type, "seq": seq}
+    if msg_type == "device_cmd":
+        result["dest"] = device_id
+        result["com"] = payload
+        return result
+    if gateway_mac:
+        result["gateway_mac" if msg_type != "gateway_alive" else "mac"] = gateway_mac
+    if msg_type == "cmd_ack":
+        # The sequence number of a command is its req_id.
+        result["req_id"] = seq
+    if msg_type == "device_join":
+        result["device_id"] = device_id
+        result["device_type"] = payload
+    elif msg_type == "device_report":
+        result["device_id"] = device_id
+        result["payload"] = payload
+    return result
+
+
+def encode_command(payload: dict[str, Any]) -> bytes | None:
+    """Frame a ``device_cmd`` payload, or return None if it must stay JSON."""
+
+    if payload.get("type") != "device_cmd":
+        return None
+    try:
+        return encode_frame(
+            "device_cmd",
+            device_id=str(payload["dest"]),
+            payload=str(payload["com"]),
+            seq=int(payload.get("req_id") or payload.get("seq") or 0),
+        )
+    except (KeyError, ValueError):
+        return None
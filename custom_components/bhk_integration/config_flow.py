@@ -13,18 +13,42 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_ACKED_DELIVERY,
+    CONF_BATCH_DELIVERY,
+    CONF_BATCH_WINDOW_MS,
+    CONF_BULK_RECEIVE,
+    CONF_COMMAND_INTERVAL_MS,
+    CONF_COMMAND_WINDOW_MS,
+    CONF_GATEWAY_FEATURES,
     CONF_GATEWAY_HW_VERSION,
     CONF_GATEWAY_IP,
     CONF_GATEWAY_MAC,
+    CONF_GATEWAY_RATE,
     CONF_GATEWAY_TYPE,
+    CONF_LIGHT_GROUPS,
     CONF_LOCAL_BIND_IP,
+    CONF_OPTIMISTIC,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_RECEIVE_BUFFER_KB,
+    CONF_RECEIVE_THREAD,
     CONF_RETRY_INTERVAL,
+    CONF_SOURCE_FILTER,
+    CONF_SOURCE_LEARNING,
+    CONF_STATE_WRITE_INTERVAL_MS,
+    DEFAULT_BATCH_WINDOW_MS,
+    DEFAULT_COMMAND_INTERVAL_MS,
+    DEFAULT_COMMAND_WINDOW_MS,
+    DEFAULT_GATEWAY_RATE,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
     DEFAULT_RETRY_INTERVAL,
+    DEFAULT_STATE_WRITE_INTERVAL_MS,
     DISCOVERY_BROADCAST_PORT,
     DISCOVERY_MESSAGE,
     DISCOVERY_WINDOW,
     DOMAIN,
+    FEATURE_GROUPS,
     GATEWAY_RESPONSE_PORT,
+    GROUP_ID_MAX,
 )
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -240,12 +264,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not mac:
             return None
 
+        # Optional capabilities, e.g. "Features": ["bin1"] or "bin1,..."
+        features = normalized.get("features") or []
+        if isinstance(features, str):
+            features = features.split(",")
+        elif not isinstance(features, list):
+            features = []
+
         return {
             CONF_GATEWAY_MAC: mac,
             CONF_GATEWAY_IP: normalized.get("ip", sender_ip),
             CONF_GATEWAY_TYPE: normalized.get("type") or normalized.get("device", "unknown"),
             CONF_GATEWAY_HW_VERSION: normalized.get("hardware_version")
             or normalized.get("version"),
+            CONF_GATEWAY_FEATURES: sorted(
+                {str(feature).strip().lower() for feature in features} - {""}
+            ),
         }
 
     def _is_configured(self, mac: str) -> bool:
@@ -273,13 +307,67 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._config_entry = config_entry
+        self._options: dict[str, Any] = {}
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         errors = {}
-        current = self._config_entry.options.get(CONF_LOCAL_BIND_IP, "")
+        options = self._config_entry.options
+        current = options.get(CONF_LOCAL_BIND_IP, "")
         schema = vol.Schema(
             {
                 vol.Optional(CONF_LOCAL_BIND_IP, default=current): cv.string,
+                vol.Optional(
+                    CONF_BATCH_DELIVERY, default=options.get(CONF_BATCH_DELIVERY, False)
+                ): bool,
+                vol.Optional(
+                    CONF_BATCH_WINDOW_MS,
+                    default=options.get(CONF_BATCH_WINDOW_MS, DEFAULT_BATCH_WINDOW_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_SOURCE_FILTER, default=options.get(CONF_SOURCE_FILTER, False)
+                ): bool,
+                vol.Optional(
+                    CONF_SOURCE_LEARNING, default=options.get(CONF_SOURCE_LEARNING, False)
+                ): bool,
+                vol.Optional(
+                    CONF_BULK_RECEIVE, default=options.get(CONF_BULK_RECEIVE, False)
+                ): bool,
+                vol.Optional(
+                    CONF_RECEIVE_BUFFER_KB, default=options.get(CONF_RECEIVE_BUFFER_KB, 0)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=16384)),
+                vol.Optional(
+                    CONF_RECEIVE_THREAD, default=options.get(CONF_RECEIVE_THREAD, False)
+                ): bool,
+                vol.Optional(
+                    CONF_COMMAND_WINDOW_MS,
+                    default=options.get(CONF_COMMAND_WINDOW_MS, DEFAULT_COMMAND_WINDOW_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_COMMAND_INTERVAL_MS,
+                    default=options.get(
+                        CONF_COMMAND_INTERVAL_MS, DEFAULT_COMMAND_INTERVAL_MS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_GATEWAY_RATE,
+                    default=options.get(CONF_GATEWAY_RATE, DEFAULT_GATEWAY_RATE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_ACKED_DELIVERY, default=options.get(CONF_ACKED_DELIVERY, False)
+                ): bool,
+                vol.Optional(
+                    CONF_OPTIMISTIC, default=options.get(CONF_OPTIMISTIC, False)
+                ): bool,
+                vol.Optional(
+                    CONF_OPTIMISTIC_TIMEOUT,
+                    default=options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Optional(
+                    CONF_STATE_WRITE_INTERVAL_MS,
+                    default=options.get(
+                        CONF_STATE_WRITE_INTERVAL_MS, DEFAULT_STATE_WRITE_INTERVAL_MS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
             }
         )
 
@@ -296,7 +384,64 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
         user_input[CONF_LOCAL_BIND_IP] = bind_ip
-        return self.async_create_entry(title="", data=user_input)
+        self._options = {**options, **user_input}
+        if FEATURE_GROUPS in (self._config_entry.data.get(CONF_GATEWAY_FEATURES) or ()):
+            return await self.async_step_groups()
+        return self.async_create_entry(title="", data=self._options)
+
+    async def async_step_groups(self, user_input=None) -> FlowResult:
+        errors = {}
+        groups: list[dict[str, Any]] = list(self._options.get(CONF_LIGHT_GROUPS) or [])
+        manager = self.hass.data.get(DOMAIN, {}).get("light_manager")
+        lights = manager.group_candidates(self._config_entry.entry_id) if manager else {}
+        schema = vol.Schema(
+            {
+                vol.Optional("group_name", default=""): cv.string,
+                vol.Optional("group_members", default=[]): cv.multi_select(
+                    {unique_id: light.name or unique_id for unique_id, light in lights.items()}
+                ),
+                vol.Optional("remove_groups", default=[]): cv.multi_select(
+                    {str(group["id"]): group["name"] for group in groups}
+                ),
+            }
+        )
+
+        if user_input is None:
+            return self.async_show_form(step_id="groups", data_schema=schema, errors=errors)
+
+        removed = set(user_input.get("remove_groups") or [])
+        groups = [group for group in groups if str(group["id"]) not in removed]
+        name = user_input.get("group_name", "").strip()
+        members = user_input.get("group_members") or []
+        if name or members:
+            used = {group["id"] for group in groups}
+            free = [gid for gid in range(1, GROUP_ID_MAX + 1) if gid not in used]
+            if not name or not members:
+                errors["base"] = "invalid_group"
+            elif not free:
+                errors["base"] = "too_many_groups"
+            else:
+                groups.append(
+                    {
+                        "id": free[0],
+                        "name": name,
+                        "members": [
+                            {
+                                "unique_id": unique_id,
+                                "dest": lights[unique_id].device_id,
+                                "endpoint": lights[unique_id].endpoint,
+                            }
+                            for unique_id in members
+                            if unique_id in lights
+                        ],
+                    }
+                )
+        if errors:
+            return self.async_show_form(step_id="groups", data_schema=schema, errors=errors)
+
+        return self.async_create_entry(
+            title="", data={**self._options, CONF_LIGHT_GROUPS: groups}
+        )
 
     def _async_schedule_remaining(self, selected_mac: str) -> None:
         remaining = [
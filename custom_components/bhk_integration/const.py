@@ -4,8 +4,39 @@ CONF_GATEWAY_MAC = "mac"
 CONF_GATEWAY_IP = "ip"
 CONF_GATEWAY_TYPE = "type"
 CONF_GATEWAY_HW_VERSION = "hardware_version"
+CONF_GATEWAY_FEATURES = "features"
 CONF_RETRY_INTERVAL = "retry_interval"
 CONF_LOCAL_BIND_IP = "local_bind_ip"
+CONF_BATCH_DELIVERY = "batch_delivery"
+CONF_BATCH_WINDOW_MS = "batch_window_ms"
+CONF_SOURCE_FILTER = "source_filter"
+CONF_SOURCE_LEARNING = "source_learning"
+CONF_BULK_RECEIVE = "bulk_receive"
+CONF_RECEIVE_BUFFER_KB = "receive_buffer_kb"
+CONF_RECEIVE_THREAD = "receive_thread"
+CONF_COMMAND_WINDOW_MS = "command_window_ms"
+CONF_ACKED_DELIVERY = "acked_delivery"
+CONF_COMMAND_INTERVAL_MS = "command_interval_ms"
+CONF_GATEWAY_RATE = "gateway_commands_per_second"
+CONF_LIGHT_GROUPS = "light_groups"
+CONF_OPTIMISTIC = "optimistic"
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+CONF_STATE_WRITE_INTERVAL_MS = "state_write_interval_ms"
+
+# Options of the UDP listener, which is shared by all entries: kept the same on every entry
+LISTENER_OPTIONS = (
+    CONF_BATCH_DELIVERY,
+    CONF_BATCH_WINDOW_MS,
+    CONF_SOURCE_FILTER,
+    CONF_SOURCE_LEARNING,
+    CONF_BULK_RECEIVE,
+    CONF_RECEIVE_BUFFER_KB,
+    CONF_RECEIVE_THREAD,
+    CONF_COMMAND_WINDOW_MS,
+    CONF_ACKED_DELIVERY,
+    CONF_COMMAND_INTERVAL_MS,
+    CONF_GATEWAY_RATE,
+)
 
 DISCOVERY_MESSAGE = "DISCOVER_GATEWAY"
 DISCOVERY_BROADCAST_PORT = 50000
@@ -14,6 +45,27 @@ DEFAULT_RETRY_INTERVAL = 10
 GATEWAY_COMMAND_PORT = 50000
 DISCOVERY_WINDOW = 30
 DEFAULT_JOIN_WINDOW_SECONDS = 120
+# Batched delivery: buffer incoming messages this long (0 = until the next loop iteration)
+DEFAULT_BATCH_WINDOW_MS = 5
+# Command coalescing: device commands to one gateway within this window share a datagram (0 = off)
+DEFAULT_COMMAND_WINDOW_MS = 10
+
+# Gateway feature accepting several device commands in one "device_cmd_multi" datagram
+FEATURE_MULTI_COMMAND = "mcmd1"
+# Gateway feature storing light groups ("group_sync") switched by one "group_cmd"
+FEATURE_GROUPS = "grp1"
+GROUP_ID_MAX = 255
+# Optimistic mode: seconds to wait for a report before reverting the assumed state
+DEFAULT_OPTIMISTIC_TIMEOUT = 10
+
+# Minimum interval between commands to one device endpoint; newer ones replace
+# a command still waiting for it (0 = off)
+DEFAULT_COMMAND_INTERVAL_MS = 250
+# Commands per second sent to one gateway before they are queued (0 = unlimited)
+DEFAULT_GATEWAY_RATE = 20
+# Minimum interval between state writes of a moving cover; the final
+# position is always written (0 = write every report)
+DEFAULT_STATE_WRITE_INTERVAL_MS = 1000
 
 SIGNAL_LIGHT_REGISTER = "bhk_integration_light_register"
 SIGNAL_LIGHT_STATE = "bhk_integration_light_state"
@@ -24,6 +76,59 @@ SIGNAL_DEVICE_REPORT = "bhk_integration_device_report"
 SIGNAL_ZB_REPORT = "bhk_integration_zb_report"
 SIGNAL_GATEWAY_ALIVE = "bhk_integration_gateway_alive"
 SIGNAL_JOIN_WINDOW = "bhk_integration_join_window"
+SIGNAL_MESSAGE_BATCH = "bhk_integration_message_batch"
+SIGNAL_COMMAND_ACK = "bhk_integration_command_ack"
+
+# Bulk receive: datagrams read per readiness event, and per-datagram buffer size
+BULK_RECEIVE_MAX_DATAGRAMS = 64
+RECEIVE_DATAGRAM_SIZE = 8192
+# Receive thread: parsed messages waiting for the event loop before new ones are dropped
+RECEIVE_THREAD_QUEUE_SIZE = 4096
+# Serialized device commands kept per (dest, com) by the send transports
+COMMAND_CACHE_SIZE = 1024
+# Most device commands carried by one multi-command datagram
+COMMAND_BATCH_MAX = 32
+
+# Acknowledged delivery: retransmit unconfirmed commands with exponential backoff
+# (first retry after the initial delay, +/- jitter) until the deadline
+COMMAND_RETRY_INITIAL_SECONDS = 0.25
+COMMAND_RETRY_MAX_SECONDS = 2.0
+COMMAND_RETRY_JITTER = 0.2
+COMMAND_DEADLINE_SECONDS = 5.0
+COMMAND_INFLIGHT_MAX = 256
+
+# Send queue priorities, highest first, and datagrams queued per gateway
+PRIORITY_INTERACTIVE = 0
+PRIORITY_RETRY = 1
+PRIORITY_BACKGROUND = 2
+SEND_QUEUE_MAX = 512
+
+# Duplicate suppression for reports relayed by several gateways
+DEDUP_TTL_SECONDS = 2.0
+DEDUP_MAX_ENTRIES = 1024
+
+# Report rate limiting (token buckets per device and per gateway)
+RATE_LIMIT_DEVICE_PER_SECOND = 10
+RATE_LIMIT_DEVICE_BURST = 20
+RATE_LIMIT_GATEWAY_PER_SECOND = 200
+RATE_LIMIT_GATEWAY_BURST = 400
+RATE_LIMIT_MAX_BUCKETS = 4096
+RATE_LIMIT_MAX_PENDING = 1024
+
+# New entities registered within this window are added with one async_add_entities call
+ENTITY_ADD_WINDOW_SECONDS = 0.05
+
+# Device cache: storage format version, and delay that batches writes after changes
+DEVICE_CACHE_VERSION = 1
+DEVICE_CACHE_SAVE_DELAY = 10
+
+# Cover travel: full-travel times learned outside this range are ignored, the
+# position of moving covers is interpolated at this interval, and a cover whose
+# end-stop report is this late after its expected arrival is settled there
+COVER_TRAVEL_MIN_SECONDS = 2
+COVER_TRAVEL_MAX_SECONDS = 300
+COVER_POSITION_TICK_SECONDS = 1
+COVER_END_STOP_GRACE_SECONDS = 10
 
 # Gateway availability timeout (seconds) – if no alive within this window, mark unavailable
 GATEWAY_ALIVE_TIMEOUT = 70
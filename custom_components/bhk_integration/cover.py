@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any
 
@@ -9,23 +12,46 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
+    CONF_GATEWAY_FEATURES,
     CONF_GATEWAY_HW_VERSION,
     CONF_GATEWAY_IP,
     CONF_GATEWAY_MAC,
     CONF_GATEWAY_TYPE,
+    CONF_OPTIMISTIC,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_STATE_WRITE_INTERVAL_MS,
+    COVER_END_STOP_GRACE_SECONDS,
+    COVER_POSITION_TICK_SECONDS,
+    COVER_TRAVEL_MAX_SECONDS,
+    COVER_TRAVEL_MIN_SECONDS,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
+    DEFAULT_STATE_WRITE_INTERVAL_MS,
     DOMAIN,
+    FEATURE_MULTI_COMMAND,
     GATEWAY_COMMAND_PORT,
     SIGNAL_COVER_REGISTER,
     SIGNAL_COVER_STATE,
-    SIGNAL_DEVICE_JOIN,
-    SIGNAL_DEVICE_REPORT,
 )
+from .availability import get_availability
+from .batching import EntityBatcher, StateWriteThrottle
+from .cache import DeviceCache
+from .codec import FEATURE_BINARY
+from .devices import DeviceHandler, ReportParser, parse_device_report
+from .gateways import EntityIndex, normalize_mac
+from .messages import (
+    CoverRegisterMessage,
+    CoverStateMessage,
+    DeviceJoinMessage,
+    DeviceReportMessage,
+)
+from .router import get_router
 from .udp import async_send_udp_command
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,7 +64,12 @@ class CoverEntryContext:
     gateway_ip: str | None
     gateway_type: str | None
     hardware_version: str | None
+    features: frozenset[str]
+    optimistic_timeout: float | None
     async_add_entities: AddEntitiesCallback
+    pending: EntityBatcher
+    cache: DeviceCache
+    writes: StateWriteThrottle
 
 
 async def async_setup_entry(
@@ -53,16 +84,30 @@ async def async_setup_entry(
 
 
 class CoverManager:
+    platform = "cover"
+
     def __init__(self, hass: HomeAssistant) -> None:
         self._hass = hass
         self._entities: dict[str, BHKCoverEntity] = {}
+        self._by_device: dict[str, BHKCoverEntity] = {}
+        self._report_parsers: dict[str, ReportParser] = {}
+        self._entity_index: EntityIndex[BHKCoverEntity] = EntityIndex()
         self._contexts: dict[str, CoverEntryContext] = {}
+        self._contexts_by_mac: dict[str, CoverEntryContext] = {}
+        self._moving: dict[str, BHKCoverEntity] = {}
+        self._motion_timer: asyncio.TimerHandle | None = None
+        self.batch_handlers = {
+            SIGNAL_COVER_REGISTER: self._handle_register,
+            SIGNAL_COVER_STATE: self._handle_state,
+        }
+        self._router = get_router(hass)
+        self._router.register_platform(self)
         self._remove_callbacks = [
             async_dispatcher_connect(hass, SIGNAL_COVER_REGISTER, self._handle_register),
             async_dispatcher_connect(hass, SIGNAL_COVER_STATE, self._handle_state),
-            async_dispatcher_connect(hass, SIGNAL_DEVICE_JOIN, self._handle_device_join),
-            async_dispatcher_connect(hass, SIGNAL_DEVICE_REPORT, self._handle_device_report),
         ]
+        self._availability = get_availability(hass)
+        self._remove_callbacks.append(self._availability.add_listener(self._update_availability))
 
     def register_entry(
         self, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -74,64 +119,117 @@ class CoverManager:
             gateway_ip=entry_data.get(CONF_GATEWAY_IP),
             gateway_type=entry_data.get(CONF_GATEWAY_TYPE),
             hardware_version=entry_data.get(CONF_GATEWAY_HW_VERSION),
+            features=entry_data.get(CONF_GATEWAY_FEATURES, frozenset()),
+            optimistic_timeout=(
+                entry.options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT)
+                if entry.options.get(CONF_OPTIMISTIC)
+                else None
+            ),
             async_add_entities=async_add_entities,
+            pending=EntityBatcher(self._hass, async_add_entities),
+            cache=entry_data["device_cache"],
+            writes=StateWriteThrottle(
+                self._hass.loop,
+                entry.options.get(
+                    CONF_STATE_WRITE_INTERVAL_MS, DEFAULT_STATE_WRITE_INTERVAL_MS
+                )
+                / 1000,
+            ),
         )
         self._contexts[entry.entry_id] = context
+        if context.gateway_mac:
+            self._contexts_by_mac[normalize_mac(context.gateway_mac)] = context
         entry.async_on_unload(lambda: self.unregister_entry(entry.entry_id))
 
+        for unique_id, record in context.cache.records("cover").items():
+            if unique_id not in self._entities:
+                self._create_entity(
+                    context, CoverRegisterMessage.from_data("cover_register", record)
+                )
+        context.pending.flush()
+
     def unregister_entry(self, entry_id: str) -> None:
-        self._contexts.pop(entry_id, None)
-        for unique_id in [
-            uid for uid, entity in self._entities.items() if entity.entry_id == entry_id
-        ]:
-            self._entities.pop(unique_id)
+        context = self._contexts.pop(entry_id, None)
+        if context is not None:
+            context.pending.cancel()
+            context.writes.cancel()
+            gateway = normalize_mac(context.gateway_mac) if context.gateway_mac else None
+            if gateway and self._contexts_by_mac.get(gateway) is context:
+                del self._contexts_by_mac[gateway]
+        for unique_id in self._entity_index.ids_for_entry(entry_id):
+            entity = self._entities.pop(unique_id)
+            self._entity_index.remove(unique_id)
+            self._moving.pop(unique_id, None)
+            if self._by_device.get(entity.device_id) is entity:
+                del self._by_device[entity.device_id]
+                self._report_parsers.pop(entity.device_id, None)
+            self._router.release(entity.device_id, self)
 
         if not self._contexts:
             for remove in self._remove_callbacks:
                 remove()
             self._remove_callbacks.clear()
+            self._router.unregister_platform(self)
+            if self._motion_timer is not None:
+                self._motion_timer.cancel()
+                self._motion_timer = None
             self._hass.data[DOMAIN].pop("cover_manager", None)
 
     @callback
-    def _handle_register(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = (
-            data.get("unique_id")
-            or data.get("device_id")
-            or data.get("id")
-            or data.get("mac")
-        )
+    def _handle_register(self, message: CoverRegisterMessage) -> None:
+        data = message.data
+        unique_id = message.unique_id
         if not unique_id:
-            _LOGGER.debug("Ignoring cover register payload without unique_id: %s", payload)
+            _LOGGER.debug("Ignoring cover register payload without unique_id: %s", data)
             return
 
         if unique_id in self._entities:
-            self._entities[unique_id].update_from_register(payload)
+            entity = self._entities[unique_id]
+            device_id = entity.device_id
+            entity.update_from_register(message)
+            if entity.device_id != device_id:
+                self._by_device.pop(device_id, None)
+                self._router.release(device_id, self)
+                self._by_device[entity.device_id] = entity
+                self._router.claim(entity.device_id, self)
+            self._remember(entity)
             return
 
-        context = self._resolve_context(data.get("gateway_mac"))
+        context = self._resolve_context(message.gateway_mac)
         if context is None:
             _LOGGER.debug("No entry context available; cannot create cover %s", unique_id)
             return
 
-        entity = BHKCoverEntity(context, payload)
-        self._entities[unique_id] = entity
-        context.async_add_entities([entity])
-
-        if "state" in data or "position" in data:
-            entity.process_state(payload)
+        self._remember(self._create_entity(context, message))
+
+    def _create_entity(
+        self, context: CoverEntryContext, message: CoverRegisterMessage
+    ) -> BHKCoverEntity:
+        entity = BHKCoverEntity(context, message)
+        self._entities[message.unique_id] = entity
+        self._entity_index.add(message.unique_id, entity, context.entry_id, entity.gateway_mac)
+        self._by_device[entity.device_id] = entity
+        self._router.claim(entity.device_id, self)
+        if entity.gateway_mac and not self._availability.is_available(
+            normalize_mac(entity.gateway_mac)
+        ):
+            entity.set_available(False)
+        context.pending.add(entity)
+
+        if message.state is not None or message.position is not None:
+            entity.process_state(message)
+        return entity
+
+    def _remember(self, entity: BHKCoverEntity) -> None:
+        if context := self._contexts.get(entity.entry_id):
+            context.cache.remember("cover", entity)
 
     @callback
-    def _handle_device_join(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        device_type = str(data.get("device_type") or "")
-        dev_id = data.get("device_id") or data.get("id") or ""
-        if not dev_id:
-            _LOGGER.debug("device_join missing id: %s", payload)
-            return
-        if "cover" not in device_type.lower():
-            return
-        gateway_mac = data.get("gateway_mac")
+    def handle_device_join(self, message: DeviceJoinMessage, handler: DeviceHandler) -> None:
+        # A cover is driven as a whole: the handler's endpoint count is not used.
+        device_type = message.device_type
+        dev_id = message.device_id
+        gateway_mac = message.gateway_mac
         register_payload = {
             "type": "cover_register",
             "unique_id": dev_id,
@@ -140,32 +238,50 @@ class CoverManager:
             "device_id": dev_id,
             "device_type": device_type,
         }
-        self._handle_register(register_payload)
+        self._handle_register(
+            CoverRegisterMessage.from_data("cover_register", register_payload)
+        )
+        if dev_id in self._by_device:
+            self._report_parsers[dev_id] = handler.parse_report
 
-    @callback
-    def _handle_device_report(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        dev_id = data.get("device_id") or data.get("id")
-        report = data.get("payload")
-        if not dev_id or not isinstance(report, str):
-            return
-        entity = self._entities.get(dev_id)
+    def apply_device_report(self, message: DeviceReportMessage) -> BHKCoverEntity | None:
+        """Apply a device report; return the entity if its state changed."""
+        entity = self._by_device.get(message.device_id)
         if entity is None:
-            _LOGGER.debug("Device report received for unknown cover %s", dev_id)
-            return
-        entity.process_report(report)
+            return None
+        parsed = self._report_parsers.get(message.device_id, parse_device_report)(message.payload)
+        if parsed is None:
+            return None
+        changed = entity.apply_report(parsed[1])
+        self._track_motion(entity)
+        if entity.set_available(True):
+            changed = True
+        return entity if changed else None
+
+    def write_reports(self, entities: Iterable[BHKCoverEntity]) -> None:
+        for entity in entities:
+            self._write(entity)
+            self._remember(entity)
+
+    def _write(self, entity: BHKCoverEntity) -> None:
+        # Positions reported while a cover moves are coalesced; where it stops is not.
+        if context := self._contexts.get(entity.entry_id):
+            context.writes.write(entity, immediate=entity.settled)
+
+    def _update_availability(self, gateway: str, available: bool) -> None:
+        for entity in self._entity_index.for_gateway(gateway):
+            if entity.set_available(available):
+                self._contexts[entity.entry_id].writes.write(entity, immediate=True)
+
+    def state_writes(self, entry_id: str) -> dict[str, Any] | None:
+        context = self._contexts.get(entry_id)
+        return context.writes.as_dict() if context else None
 
     @callback
-    def _handle_state(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = (
-            data.get("unique_id")
-            or data.get("device_id")
-            or data.get("id")
-            or data.get("mac")
-        )
+    def _handle_state(self, message: CoverStateMessage) -> None:
+        unique_id = message.unique_id
         if not unique_id:
-            _LOGGER.debug("Ignoring cover state payload without unique_id: %s", payload)
+            _LOGGER.debug("Ignoring cover state payload without unique_id: %s", message.data)
             return
 
         entity = self._entities.get(unique_id)
@@ -173,13 +289,40 @@ class CoverManager:
             _LOGGER.debug("State update received for unknown cover %s", unique_id)
             return
 
-        entity.process_state(payload)
+        if entity.process_state(message):
+            self._write(entity)
+        self._track_motion(entity)
+        self._remember(entity)
+
+    def _track_motion(self, entity: BHKCoverEntity) -> None:
+        if not entity.moving:
+            self._moving.pop(entity.unique_id, None)
+            return
+        self._moving[entity.unique_id] = entity
+        if self._motion_timer is None:
+            self._motion_timer = self._hass.loop.call_later(
+                COVER_POSITION_TICK_SECONDS, self._advance_moving
+            )
+
+    def _advance_moving(self) -> None:
+        # One timer for every travelling cover, running only while one is.
+        self._motion_timer = None
+        now = time.monotonic()
+        for unique_id, entity in list(self._moving.items()):
+            if entity.interpolate(now):
+                self._write(entity)
+            if not entity.moving:
+                del self._moving[unique_id]
+        if self._moving:
+            self._motion_timer = self._hass.loop.call_later(
+                COVER_POSITION_TICK_SECONDS, self._advance_moving
+            )
 
     def _resolve_context(self, gateway_mac: str | None) -> CoverEntryContext | None:
         if gateway_mac:
-            for context in self._contexts.values():
-                if context.gateway_mac and context.gateway_mac.lower() == gateway_mac.lower():
-                    return context
+            context = self._contexts_by_mac.get(normalize_mac(gateway_mac))
+            if context is not None:
+                return context
         return next(iter(self._contexts.values()), None)
 
 
@@ -192,25 +335,32 @@ class BHKCoverEntity(CoverEntity):
         | CoverEntityFeature.STOP
     )
 
-    def __init__(self, context: CoverEntryContext, payload: dict[str, Any]) -> None:
+    def __init__(self, context: CoverEntryContext, message: CoverRegisterMessage) -> None:
         self.entry_id = context.entry_id
-        normalized = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = (
-            normalized.get("unique_id")
-            or normalized.get("device_id")
-            or normalized.get("id")
-            or normalized.get("mac")
-        )
+        unique_id = message.unique_id
         self._attr_unique_id = unique_id
-        self._gateway_mac = normalized.get("gateway_mac") or context.gateway_mac
+        self._gateway_mac = message.gateway_mac or context.gateway_mac
         self._gateway_ip = context.gateway_ip
         self._gateway_type = context.gateway_type
         self._hardware_version = context.hardware_version
-        self._device_id = normalized.get("device_id") or normalized.get("id") or unique_id
-        self._attr_name = payload.get("name") or f"Cover {unique_id}"
+        self._binary = FEATURE_BINARY in context.features
+        self._coalesce = FEATURE_MULTI_COMMAND in context.features
+        self._optimistic_timeout = context.optimistic_timeout
+        self._assumed_from: tuple[bool | None, int | None] = (None, None)
+        self._cancel_rollback: CALLBACK_TYPE | None = None
+        self.settled = True
+        self._device_id = message.device_id or unique_id
+        self._attr_name = message.name or f"Cover {unique_id}"
         self._attr_is_closed: bool | None = None
         self._attr_current_cover_position: int | None = None
         self._attr_available = True
+        self._open_time = message.open_time
+        self._close_time = message.close_time
+        # +1 opening, -1 closing, 0 stopped; the position and monotonic time
+        # the interpolation starts from; when it left an end stop, if it did.
+        self._direction = 0
+        self._anchor: tuple[float, float] | None = None
+        self._travel_started: float | None = None
         if self._gateway_mac:
             self._attr_device_info = DeviceInfo(
                 identifiers={(DOMAIN, self._gateway_mac)},
@@ -222,18 +372,143 @@ class BHKCoverEntity(CoverEntity):
         else:
             self._attr_device_info = None
 
-    def update_from_register(self, payload: dict[str, Any]) -> None:
-        name = payload.get("name")
+    @property
+    def gateway_mac(self) -> str | None:
+        return self._gateway_mac
+
+    @property
+    def device_id(self) -> str:
+        return self._device_id
+
+    def set_available(self, available: bool) -> bool:
+        if self._attr_available == available:
+            return False
+        self._attr_available = available
+        return True
+
+    def as_cache_record(self) -> dict[str, Any]:
+        # The last reported state, not one assumed while a command is unconfirmed.
+        if self._cancel_rollback is not None:
+            is_closed, position = self._assumed_from
+        else:
+            is_closed, position = self._attr_is_closed, self._attr_current_cover_position
+        return {
+            "unique_id": self._attr_unique_id,
+            "name": self._attr_name,
+            "gateway_mac": self._gateway_mac,
+            "device_id": self._device_id,
+            "state": None if is_closed is None else ("closed" if is_closed else "open"),
+            "position": position,
+            "open_time": self._open_time,
+            "close_time": self._close_time,
+        }
+
+    def update_from_register(self, message: CoverRegisterMessage) -> None:
+        name = message.name
         if name and name != self._attr_name:
             self._attr_name = name
-            self.async_write_ha_state()
-        normalized = {str(k).lower(): v for k, v in payload.items()}
-        if normalized.get("device_id") or normalized.get("id"):
-            self._device_id = normalized.get("device_id") or normalized.get("id")
+            if self.hass is not None:
+                self.async_write_ha_state()
+        if message.device_id:
+            self._device_id = message.device_id
+        # Travel times set on the gateway replace the learned ones.
+        if message.open_time:
+            self._open_time = message.open_time
+        if message.close_time:
+            self._close_time = message.close_time
+
+    @property
+    def moving(self) -> bool:
+        """Whether the position is interpolated between reports."""
+        return self._anchor is not None
+
+    def _snapshot(self) -> tuple[bool | None, int | None, int]:
+        return self._attr_is_closed, self._attr_current_cover_position, self._direction
+
+    def _travel_time(self, direction: int) -> float | None:
+        return self._open_time if direction > 0 else self._close_time
+
+    def _move(self, direction: int, position: int | None) -> None:
+        if direction == self._direction:
+            return
+        now = time.monotonic()
+        self._direction = direction
+        self._attr_is_opening = direction > 0
+        self._attr_is_closing = direction < 0
+        self._travel_started = now if position == (0 if direction > 0 else 100) else None
+        self._anchor = None
+        if position is not None and self._travel_time(direction):
+            self._anchor = (position, now)
+
+    def _reanchor(self, position: int) -> None:
+        # A position reported on the way corrects the interpolation.
+        if self._direction and self._travel_time(self._direction):
+            self._anchor = (position, time.monotonic())
+
+    def _halt(self, end: int | None) -> None:
+        """Stop travelling; ``end`` is the end stop (0 or 100) reached, if any."""
+        if (
+            self._travel_started is not None
+            and end == (100 if self._direction > 0 else 0)
+        ):
+            self._learn(self._direction, time.monotonic() - self._travel_started)
+        self._direction = 0
+        self._attr_is_opening = self._attr_is_closing = False
+        self._anchor = None
+        self._travel_started = None
+
+    def _learn(self, direction: int, elapsed: float) -> None:
+        if not COVER_TRAVEL_MIN_SECONDS <= elapsed <= COVER_TRAVEL_MAX_SECONDS:
+            return
+        previous = self._travel_time(direction)
+        learned = round(elapsed if previous is None else (previous + elapsed) / 2, 1)
+        if direction > 0:
+            self._open_time = learned
+        else:
+            self._close_time = learned
+        _LOGGER.debug(
+            "Learned %s travel time of %s: %ss",
+            "open" if direction > 0 else "close",
+            self._attr_unique_id,
+            learned,
+        )
+
+    def interpolate(self, now: float) -> bool:
+        """Move the position along the travel time; return True if it changed."""
+        if self._anchor is None:
+            return False
+        start, since = self._anchor
+        travel_time = self._travel_time(self._direction)
+        travelled = 100 * (now - since) / travel_time
+        end = 100 if self._direction > 0 else 0
+        position = max(0, min(100, round(start + self._direction * travelled)))
+        if position == end and (
+            now >= since + travel_time * abs(end - start) / 100 + COVER_END_STOP_GRACE_SECONDS
+        ):
+            # The OPENED/CLOSED report is overdue (lost): settle at the end stop.
+            before = self._snapshot()
+            self._halt(None)
+            self._attr_is_closed = end == 0
+            self._attr_current_cover_position = end
+            self.settled = True
+            return self._snapshot() != before
+        # At the end stop, wait there for the device to confirm the end of travel.
+        if position == self._attr_current_cover_position:
+            return False
+        self._attr_current_cover_position = position
+        return True
+
+    def process_state(self, message: CoverRegisterMessage) -> bool:
+        """Apply a state message; return True if the state changed."""
+        before = self._snapshot()
+        self.interpolate(time.monotonic())
+        _, reported_position = self._end_optimistic()
+        raw_state = message.state
+        self.settled = raw_state not in ("opening", "closing")
+        new_position = self._attr_current_cover_position
+        if message.position is not None:
+            new_position = message.position
 
-    def process_state(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        raw_state = str(data.get("state", "")).lower()
         new_is_closed: bool | None
         if raw_state in ("open", "opened"):
             new_is_closed = False
@@ -241,29 +516,38 @@ class BHKCoverEntity(CoverEntity):
             new_is_closed = True
         elif raw_state in ("opening", "closing"):
             new_is_closed = None
+            if message.position is None:
+                new_position = reported_position
+            self._move(1 if raw_state == "opening" else -1, new_position)
         else:
             new_is_closed = self._attr_is_closed
 
-        position = data.get("position")
-        new_position: int | None = self._attr_current_cover_position
-        if isinstance(position, (int, float)):
-            new_position = max(0, min(100, int(position)))
-
-        if new_is_closed != self._attr_is_closed or new_position != self._attr_current_cover_position:
-            self._attr_is_closed = new_is_closed
-            self._attr_current_cover_position = new_position
-            self.async_write_ha_state()
-
-    def process_report(self, report: str) -> None:
+        if raw_state in ("opening", "closing") or (
+            raw_state is None and new_position not in (0, 100)
+        ):
+            if message.position is not None:
+                self._reanchor(message.position)
+        else:
+            self._halt(new_position if new_position in (0, 100) else None)
+        self._attr_is_closed = new_is_closed
+        self._attr_current_cover_position = new_position
+        return self._snapshot() != before
+
+    def apply_report(self, report: str) -> bool:
+        """Apply a device report; return True if the state changed."""
+        before = self._snapshot()
+        self.interpolate(time.monotonic())
+        _, reported_position = self._end_optimistic()
         state = report.strip()
         state_upper = state.upper()
         new_is_closed = self._attr_is_closed
         new_position = self._attr_current_cover_position
-        if state_upper == "OPENING":
-            new_is_closed = None
-        elif state_upper == "CLOSING":
+        if state_upper in ("OPENING", "CLOSING"):
             new_is_closed = None
+            new_position = reported_position
+            self._move(1 if state_upper == "OPENING" else -1, new_position)
         elif state_upper == "STOP":
+            self._halt(None)
             if isinstance(new_position, int):
                 if new_position == 0:
                     new_is_closed = True
@@ -274,9 +558,11 @@ class BHKCoverEntity(CoverEntity):
         elif state_upper == "OPENED":
             new_is_closed = False
             new_position = 100
+            self._halt(100)
         elif state_upper == "CLOSED":
             new_is_closed = True
             new_position = 0
+            self._halt(0)
         elif state_upper.startswith("P:"):
             try:
                 percent = int(state_upper.split(":", 1)[1])
@@ -291,44 +577,86 @@ class BHKCoverEntity(CoverEntity):
                     new_is_closed = False
                 else:
                     new_is_closed = None
+                if percent in (0, 100):
+                    self._halt(percent)
+                else:
+                    self._reanchor(percent)
+
+        self.settled = new_is_closed is not None or state_upper == "STOP"
+        self._attr_is_closed = new_is_closed
+        self._attr_current_cover_position = new_position
+        return self._snapshot() != before
 
-        if new_is_closed != self._attr_is_closed or new_position != self._attr_current_cover_position:
-            self._attr_is_closed = new_is_closed
-            self._attr_current_cover_position = new_position
+    def _end_optimistic(self) -> tuple[bool | None, int | None]:
+        """Drop an assumed state, which the device's report replaces; return the reported one."""
+        if self._cancel_rollback is None:
+            return self._attr_is_closed, self._attr_current_cover_position
+        self._cancel_rollback()
+        self._cancel_rollback = None
+        return self._assumed_from
+
+    @callback
+    def _assume_position(self, position: int) -> None:
+        """Show a commanded position until a report settles it or the timeout reverts it."""
+        if self._cancel_rollback is None:
+            self._assumed_from = (self._attr_is_closed, self._attr_current_cover_position)
+        else:
+            self._cancel_rollback()
+        self._cancel_rollback = async_call_later(
+            self.hass, self._optimistic_timeout, self._async_rollback
+        )
+        self._set_state(position == 0, position)
+
+    @callback
+    def _async_rollback(self, _now) -> None:
+        self._cancel_rollback = None
+        _LOGGER.debug("No report for %s; reverting optimistic state", self._attr_unique_id)
+        self._set_state(*self._assumed_from)
+
+    def _set_state(self, is_closed: bool | None, position: int | None) -> None:
+        if is_closed != self._attr_is_closed or position != self._attr_current_cover_position:
+            self._attr_is_closed = is_closed
+            self._attr_current_cover_position = position
             self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        self._end_optimistic()
+
     async def async_open_cover(self, **kwargs: Any) -> None:
-        await self._async_send_command("OPEN")
+        if await self._async_send_command("OPEN") and self._optimistic_timeout:
+            self._assume_position(100)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
-        await self._async_send_command("CLOSE")
+        if await self._async_send_command("CLOSE") and self._optimistic_timeout:
+            self._assume_position(0)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         position = kwargs.get("position")
         if position is None:
             return
         percent = max(0, min(100, int(position)))
-        await self._async_send_command(f"P:{percent}")
+        if await self._async_send_command(f"P:{percent}") and self._optimistic_timeout:
+            self._assume_position(percent)
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         await self._async_send_command("STOP")
 
-    async def _async_send_command(self, command: str | None = None) -> None:
+    async def _async_send_command(self, command: str | None = None) -> bool:
         if not self._gateway_ip:
             _LOGGER.warning(
                 "Cannot send cover command for %s; gateway IP unknown", self._attr_unique_id
             )
-            return
+            return False
 
         if not self._device_id:
             _LOGGER.warning(
                 "Cannot send cover command for %s; missing device id", self._attr_unique_id
             )
-            return
+            return False
 
         if not command:
             _LOGGER.debug("No command specified for cover %s", self._attr_unique_id)
-            return
+            return False
 
         payload: dict[str, Any] = {
             "type": "device_cmd",
@@ -343,4 +671,11 @@ class BHKCoverEntity(CoverEntity):
             GATEWAY_COMMAND_PORT,
             payload,
         )
-        await async_send_udp_command(self.hass, self._gateway_ip, payload)
+        await async_send_udp_command(
+            self.hass,
+            self._gateway_ip,
+            payload,
+            binary=self._binary,
+            coalesce=self._coalesce,
+        )
+        return True
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .const import DEDUP_MAX_ENTRIES, DEDUP_TTL_SECONDS
+
+
+class DuplicateFilter:
+    """Bounded TTL/LRU cache dropping messages relayed by more than one gateway.
+
+    Messages are keyed on (type, device id, payload, sequence). Without a
+    sequence number the same report can legitimately repeat (ON, OFF, ON), so
+    a repeat only counts as a duplicate when it comes from another source
+    than the first copy and is still the device's latest payload: ON via A,
+    OFF via A, ON via B passes. With a sequence number any repeat is a
+    duplicate.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEDUP_TTL_SECONDS,
+        max_entries: int = DEDUP_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._seen: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.passed = 0
+        self.dropped = 0
+
+    def is_duplicate(
+        self,
+        msg_type: str,
+        device_id: str | None,
+        payload: Any,
+        seq: Any,
+        source: Any,
+    ) -> bool:
+        now = self._clock()
+        seen = self._seen
+        # Entries are kept in insertion order, so expired ones sit at the front.
+        cutoff = now - self._ttl
+        while seen:
+            first_key, (first_seen, _) = next(iter(seen.items()))
+            if first_seen >= cutoff:
+                break
+            del seen[first_key]
+
+        key = (msg_type, device_id, payload, seq)
+        latest_key = (msg_type, device_id)
+        previous = seen.get(key)
+        if previous is not None and (
+            seq is not None
+            or (previous[1] != source and seen.get(latest_key, (0, None))[1] == payload)
+        ):
+            self.dropped += 1
+            return True
+
+        seen[key] = (now, source)
+        seen.move_to_end(key)
+        # The device's latest payload, for the cross-source check above.
+        seen[latest_key] = (now, payload)
+        seen.move_to_end(latest_key)
+        while len(seen) > self._max_entries:
+            seen.popitem(last=False)
+        self.passed += 1
+        return False
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "passed": self.passed,
+            "dropped": self.dropped,
+            "tracked": len(self._seen),
+        }
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Hashable
+from functools import partial
+from typing import Any
+
+from .const import (
+    COMMAND_DEADLINE_SECONDS,
+    COMMAND_INFLIGHT_MAX,
+    COMMAND_RETRY_INITIAL_SECONDS,
+    COMMAND_RETRY_JITTER,
+    COMMAND_RETRY_MAX_SECONDS,
+)
+from .gateways import normalize_mac
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _InFlight:
+    __slots__ = (
+        "req_id",
+        "slot",
+        "expect",
+        "data",
+        "bind_ip",
+        "addr",
+        "attempts",
+        "deadline",
+        "handle",
+    )
+
+    def __init__(
+        self,
+        req_id: str,
+        slot: Hashable,
+        expect: str | None,
+        data: bytes,
+        bind_ip: str,
+        addr: tuple[str, int],
+        deadline: float,
+    ) -> None:
+        self.req_id = req_id
+        self.slot = slot
+        self.expect = expect
+        self.data = data
+        self.bind_ip = bind_ip
+        self.addr = addr
+        self.attempts = 1
+        self.deadline = deadline
+        self.handle: asyncio.TimerHandle | None = None
+
+
+class CommandTracker:
+    """In-flight table for commands that expect a confirmation.
+
+    A command is confirmed by a ``cmd_ack`` carrying its ``req_id`` or by the
+    message it causes: the matching ``device_report`` for a device command,
+    the ``join_window`` announce for ``open_join``. Group commands and group
+    provisioning are only confirmed by ``cmd_ack``. Until then it is sent
+    again with exponential backoff and jitter, up to a deadline. The backoff
+    runs from ``sent()``, when a copy actually leaves the send queue, so a
+    command held back by pacing is not retransmitted before it went out.
+    Only the latest command per device endpoint is tracked, so
+    retransmitting an old ON can never undo a newer OFF.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[str, bytes, tuple[str, int], Callable[[], None]], bool],
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._loop = loop
+        self._send = send
+        self._clock = clock
+        self._rng = rng
+        self._next_id = 0
+        self._in_flight: dict[str, _InFlight] = {}
+        self._by_slot: dict[Hashable, _InFlight] = {}
+        self.tracked = 0
+        self.acked = 0
+        self.confirmed = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.superseded = 0
+        self.evicted = 0
+
+    def next_id(self) -> int:
+        # Fits the 16-bit sequence field of binary frames; 0 means "no id".
+        self._next_id = self._next_id % 0xFFFF + 1
+        return self._next_id
+
+    def track(
+        self,
+        payload: dict[str, Any],
+        data: bytes,
+        bind_ip: str,
+        addr: tuple[str, int],
+    ) -> str | None:
+        """Start tracking a command; return its req_id, to pass to sent()."""
+        slot, expect = _slot_for_command(payload)
+        if slot is None:
+            return None
+        if previous := self._by_slot.get(slot):
+            self._forget(previous)
+            self.superseded += 1
+        if len(self._in_flight) >= COMMAND_INFLIGHT_MAX:
+            self._forget(next(iter(self._in_flight.values())))
+            self.evicted += 1
+
+        now = self._clock()
+        entry = _InFlight(
+            str(payload["req_id"]),
+            slot,
+            expect,
+            data,
+            bind_ip,
+            addr,
+            now + COMMAND_DEADLINE_SECONDS,
+        )
+        self._in_flight[entry.req_id] = entry
+        self._by_slot[slot] = entry
+        self.tracked += 1
+        return entry.req_id
+
+    def sent(self, req_id: str) -> None:
+        entry = self._in_flight.get(req_id)
+        if entry is not None and entry.handle is None:
+            self._schedule(entry, self._clock())
+
+    def discard(self, req_id: str) -> None:
+        if entry := self._in_flight.get(req_id):
+            self._forget(entry)
+
+    def acknowledge(self, req_id: Any) -> bool:
+        entry = self._in_flight.get(str(req_id)) if req_id is not None else None
+        if entry is None:
+            return False
+        self._forget(entry)
+        self.acked += 1
+        return True
+
+    def confirm_report(self, device_id: str | None, payload: str | None) -> bool:
+        if not device_id or payload is None:
+            return False
+        device = str(device_id).upper()
+        endpoint, sep, _ = payload.partition("_")
+        entry = self._by_slot.get((device, endpoint)) if sep else None
+        if entry is None:
+            entry = self._by_slot.get((device, ""))
+        if entry is None or (entry.expect is not None and entry.expect != payload.upper()):
+            return False
+        self._forget(entry)
+        self.confirmed += 1
+        return True
+
+    def confirm_join(self, gateway_mac: str | None, req_id: Any = None) -> bool:
+        if req_id is not None and self.acknowledge(req_id):
+            return True
+        if not gateway_mac:
+            return False
+        entry = self._by_slot.get(("open_join", normalize_mac(gateway_mac)))
+        if entry is None:
+            return False
+        self._forget(entry)
+        self.confirmed += 1
+        return True
+
+    def _schedule(self, entry: _InFlight, now: float) -> None:
+        backoff = min(
+            COMMAND_RETRY_MAX_SECONDS,
+            COMMAND_RETRY_INITIAL_SECONDS * 2 ** (entry.attempts - 1),
+        )
+        backoff *= 1 + COMMAND_RETRY_JITTER * (2 * self._rng() - 1)
+        delay = min(backoff, max(entry.deadline - now, 0))
+        entry.handle = self._loop.call_later(delay, self._retransmit, entry)
+
+    def _retransmit(self, entry: _InFlight) -> None:
+        entry.handle = None
+        now = self._clock()
+        if now >= entry.deadline:
+            self._forget(entry)
+            self.timeouts += 1
+            _LOGGER.debug(
+                "Command %s to %s not confirmed after %d attempts",
+                entry.req_id,
+                entry.addr[0],
+                entry.attempts,
+            )
+            return
+        entry.attempts += 1
+        self.retries += 1
+        on_sent = partial(self.sent, entry.req_id)
+        if not self._send(entry.bind_ip, entry.data, entry.addr, on_sent):
+            self._forget(entry)
+
+    def _forget(self, entry: _InFlight) -> None:
+        if entry.handle is not None:
+            entry.handle.cancel()
+            entry.handle = None
+        self._in_flight.pop(entry.req_id, None)
+        if self._by_slot.get(entry.slot) is entry:
+            del self._by_slot[entry.slot]
+
+    def cancel(self) -> None:
+        for entry in self._in_flight.values():
+            if entry.handle is not None:
+                entry.handle.cancel()
+        self._in_flight.clear()
+        self._by_slot.clear()
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "tracked": self.tracked,
+            "acked": self.acked,
+            "confirmed_by_report": self.confirmed,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "superseded": self.superseded,
+            "evicted": self.evicted,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def _slot_for_command(payload: dict[str, Any]) -> tuple[Hashable | None, str | None]:
+    """Return the endpoint a command targets and the report that confirms it.
+
+    Light commands ("2_ON") are confirmed by the identical report; commands
+    without an endpoint (covers: OPEN, P:30, ...) by any report of the device.
+    """
+
+    msg_type = payload.get("type")
+    if msg_type == "device_cmd" and payload.get("dest"):
+        com = str(payload.get("com", "")).upper()
+        endpoint, sep, _ = com.partition("_")
+        if sep:
+            return (str(payload["dest"]).upper(), endpoint), com
+        return (str(payload["dest"]).upper(), ""), None
+    if msg_type == "open_join" and payload.get("target_mac"):
+        return ("open_join", normalize_mac(payload["target_mac"])), None
+    if msg_type == "group_cmd" and payload.get("target_mac"):
+        return ("group_cmd", normalize_mac(payload["target_mac"]), payload.get("group")), None
+    if msg_type == "group_sync" and payload.get("target_mac"):
+        return ("group_sync", normalize_mac(payload["target_mac"])), None
+    return None, None
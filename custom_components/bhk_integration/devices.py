@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+
+# A report parser turns a device_report payload into (endpoint, state); the
+# endpoint is None for devices that report without one.
+ReportParser = Callable[[str], "tuple[int | None, str] | None"]
+
+
+def parse_endpoint_report(payload: str) -> tuple[int | None, str] | None:
+    """Parse "<endpoint>_<state>", e.g. "2_ON"."""
+    endpoint, sep, state = payload.partition("_")
+    if not sep:
+        return None
+    try:
+        return int(endpoint), state
+    except ValueError:
+        return None
+
+
+def parse_device_report(payload: str) -> tuple[int | None, str] | None:
+    return None, payload.strip()
+
+
+@dataclass(slots=True, frozen=True)
+class DeviceHandler:
+    """What the integration makes of a device_type announced in device_join."""
+
+    platform: str
+    endpoints: int
+    parse_report: ReportParser
+
+
+DEVICE_HANDLERS: dict[str, DeviceHandler] = {
+    "3lights": DeviceHandler("light", 3, parse_endpoint_report),
+    "cover": DeviceHandler("cover", 1, parse_device_report),
+}
+
+_LIGHTS_TYPE = re.compile(r"(\d{1,3})\s*lights?")
+
+# device_type strings come from the network: only this many resolved ones are indexed.
+DEVICE_TYPE_INDEX_MAX = 256
+
+
+class DeviceTypeRegistry:
+    """Maps device_type strings to their DeviceHandler.
+
+    Lookups are one dict access by the device_type exactly as the device
+    sends it. A type not seen before is resolved case-insensitively against
+    the registered handlers and then the generic patterns (a type containing
+    "<N>Lights" has N endpoints, one naming a cover is a cover). A handler
+    found is indexed under that exact string, up to DEVICE_TYPE_INDEX_MAX
+    types; unknown types are not indexed.
+    """
+
+    def __init__(self, handlers: dict[str, DeviceHandler]) -> None:
+        self._handlers: dict[str, DeviceHandler] = {}
+        self._index: dict[str, DeviceHandler] = {}
+        for device_type, handler in handlers.items():
+            self.register(device_type, handler)
+
+    def register(self, device_type: str, handler: DeviceHandler) -> None:
+        self._handlers[device_type.lower()] = handler
+        self._index.clear()
+
+    def lookup(self, device_type: str) -> DeviceHandler | None:
+        try:
+            return self._index[device_type]
+        except KeyError:
+            handler = self._resolve(device_type)
+            if handler is not None and len(self._index) < DEVICE_TYPE_INDEX_MAX:
+                self._index[device_type] = handler
+            return handler
+
+    def _resolve(self, device_type: str) -> DeviceHandler | None:
+        key = device_type.strip().lower()
+        if handler := self._handlers.get(key):
+            return handler
+        if match := _LIGHTS_TYPE.search(key):
+            endpoints = int(match.group(1))
+            if endpoints:
+                return DeviceHandler("light", endpoints, parse_endpoint_report)
+        if "cover" in key:
+            return self._handlers["cover"]
+        return None
+
+
+DEVICE_TYPES = DeviceTypeRegistry(DEVICE_HANDLERS)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_GATEWAY_FEATURES, CONF_GATEWAY_IP, CONF_GATEWAY_MAC, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    domain_data = hass.data.get(DOMAIN, {})
+    entry_data = domain_data.get(entry.entry_id, {})
+    listener = domain_data.get("udp_listener")
+    router = domain_data.get("device_router")
+    availability = domain_data.get("availability")
+    cover_manager = domain_data.get("cover_manager")
+
+    socket_info = None
+    if listener is not None:
+        socket_info = await hass.async_add_executor_job(listener.socket_diagnostics)
+
+    return {
+        "gateway": {
+            "mac": entry_data.get(CONF_GATEWAY_MAC),
+            "ip": entry_data.get(CONF_GATEWAY_IP),
+            "features": sorted(entry_data.get(CONF_GATEWAY_FEATURES, ())),
+        },
+        "udp_listener": listener.diagnostics() if listener else None,
+        "udp_socket": socket_info,
+        "device_router": router.as_dict() if router else None,
+        "gateway_availability": availability.as_dict() if availability else None,
+        "cover_state_writes": (
+            cover_manager.state_writes(entry.entry_id) if cover_manager else None
+        ),
+    }
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Generic, TypeVar
+
+from .const import CONF_GATEWAY_IP, CONF_GATEWAY_MAC
+
+_EntityT = TypeVar("_EntityT")
+
+
+def normalize_mac(mac: Any) -> str:
+    """Return a MAC as lower-case hex without separators ("aabbccddeeff")."""
+
+    return str(mac).replace(":", "").replace("-", "").lower()
+
+
+class GatewayIndex:
+    """Known gateway addresses, checked against the sender of every datagram."""
+
+    def __init__(self) -> None:
+        self.ips: set[str] = set()
+        self._entries_by_mac: dict[str, str] = {}
+        self.unknown_dropped = 0
+        self.learned = 0
+
+    def rebuild(self, domain_data: Mapping[str, Any]) -> None:
+        """Index the gateways of every config entry stored in hass.data[DOMAIN]."""
+
+        ips: set[str] = set()
+        entries_by_mac: dict[str, str] = {}
+        for entry_id, entry_data in domain_data.items():
+            if not isinstance(entry_data, dict) or CONF_GATEWAY_MAC not in entry_data:
+                continue
+            if entry_data.get(CONF_GATEWAY_IP):
+                ips.add(str(entry_data[CONF_GATEWAY_IP]))
+            if entry_data.get(CONF_GATEWAY_MAC):
+                entries_by_mac[normalize_mac(entry_data[CONF_GATEWAY_MAC])] = entry_id
+        self.ips = ips
+        self._entries_by_mac = entries_by_mac
+
+    def entry_for_mac(self, mac: Any) -> str | None:
+        if not mac:
+            return None
+        return self._entries_by_mac.get(normalize_mac(mac))
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "known_ips": len(self.ips),
+            "known_macs": len(self._entries_by_mac),
+            "unknown_dropped": self.unknown_dropped,
+            "learned": self.learned,
+        }
+
+
+class EntityIndex(Generic[_EntityT]):
+    """Secondary indexes of a manager's entities by gateway MAC and config entry.
+
+    The manager keeps its own unique_id -> entity dict; this only answers
+    "which entities belong to gateway X / entry Y" without scanning them all.
+    Gateway MACs are canonicalized with normalize_mac.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[str, tuple[str, str]] = {}
+        self._by_gateway: dict[str, dict[str, _EntityT]] = {}
+        self._by_entry: dict[str, dict[str, _EntityT]] = {}
+
+    def add(self, unique_id: str, entity: _EntityT, entry_id: str, gateway_mac: Any) -> None:
+        self.remove(unique_id)
+        gateway = normalize_mac(gateway_mac) if gateway_mac else ""
+        self._keys[unique_id] = (entry_id, gateway)
+        self._by_entry.setdefault(entry_id, {})[unique_id] = entity
+        self._by_gateway.setdefault(gateway, {})[unique_id] = entity
+
+    def remove(self, unique_id: str) -> None:
+        keys = self._keys.pop(unique_id, None)
+        if keys is None:
+            return
+        for index, key in zip((self._by_entry, self._by_gateway), keys):
+            bucket = index[key]
+            del bucket[unique_id]
+            if not bucket:
+                del index[key]
+
+    def for_gateway(self, gateway_key: str) -> Iterable[_EntityT]:
+        """Entities of a gateway, by MAC already passed through normalize_mac."""
+        return self._by_gateway.get(gateway_key, {}).values()
+
+    def ids_for_entry(self, entry_id: str) -> list[str]:
+        return list(self._by_entry.get(entry_id, ()))
@@ -1,32 +1,49 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.light import ColorMode, LightEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
+    CONF_GATEWAY_FEATURES,
     CONF_GATEWAY_HW_VERSION,
     CONF_GATEWAY_IP,
     CONF_GATEWAY_MAC,
     CONF_GATEWAY_TYPE,
+    CONF_LIGHT_GROUPS,
+    CONF_OPTIMISTIC,
+    CONF_OPTIMISTIC_TIMEOUT,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
     DOMAIN,
-    GATEWAY_ALIVE_TIMEOUT,
+    FEATURE_GROUPS,
+    FEATURE_MULTI_COMMAND,
     GATEWAY_COMMAND_PORT,
-    SIGNAL_DEVICE_JOIN,
-    SIGNAL_DEVICE_REPORT,
-    SIGNAL_GATEWAY_ALIVE,
+    PRIORITY_BACKGROUND,
     SIGNAL_LIGHT_REGISTER,
     SIGNAL_LIGHT_STATE,
 )
+from .availability import get_availability
+from .batching import EntityBatcher
+from .cache import DeviceCache
+from .codec import FEATURE_BINARY
+from .devices import DEVICE_TYPES, DeviceHandler, ReportParser, parse_endpoint_report
+from .gateways import EntityIndex, normalize_mac
+from .messages import (
+    DeviceJoinMessage,
+    DeviceReportMessage,
+    LightRegisterMessage,
+    LightStateMessage,
+)
+from .router import get_router
 from .udp import async_send_udp_command
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,7 +56,11 @@ class LightEntryContext:
     gateway_ip: str | None
     gateway_type: str | None
     hardware_version: str | None
+    features: frozenset[str]
+    optimistic_timeout: float | None
     async_add_entities: AddEntitiesCallback
+    pending: EntityBatcher
+    cache: DeviceCache
 
 
 async def async_setup_entry(
@@ -54,21 +75,30 @@ async def async_setup_entry(
 
 
 class LightManager:
+    platform = "light"
+
     def __init__(self, hass: HomeAssistant) -> None:
         self._hass = hass
         self._entities: dict[str, BHKLightEntity] = {}
+        self._entity_index: EntityIndex[BHKLightEntity] = EntityIndex()
+        self._report_parsers: dict[str, ReportParser] = {}
+        self._groups: dict[str, BHKLightGroupEntity] = {}
+        self._group_index: EntityIndex[BHKLightGroupEntity] = EntityIndex()
+        self._groups_by_member: dict[str, list[BHKLightGroupEntity]] = {}
         self._contexts: dict[str, LightEntryContext] = {}
-        self._last_alive: dict[str, datetime] = {}
-        self._watchdog_unsub = async_track_time_interval(
-            hass, self._watchdog, timedelta(seconds=15)
-        )
+        self._contexts_by_mac: dict[str, LightEntryContext] = {}
+        self.batch_handlers = {
+            SIGNAL_LIGHT_REGISTER: self._handle_register,
+            SIGNAL_LIGHT_STATE: self._handle_state,
+        }
+        self._router = get_router(hass)
+        self._router.register_platform(self)
         self._remove_callbacks = [
             async_dispatcher_connect(hass, SIGNAL_LIGHT_REGISTER, self._handle_register),
             async_dispatcher_connect(hass, SIGNAL_LIGHT_STATE, self._handle_state),
-            async_dispatcher_connect(hass, SIGNAL_DEVICE_JOIN, self._handle_device_join),
-            async_dispatcher_connect(hass, SIGNAL_DEVICE_REPORT, self._handle_device_report),
-            async_dispatcher_connect(hass, SIGNAL_GATEWAY_ALIVE, self._handle_gateway_alive),
         ]
+        self._availability = get_availability(hass)
+        self._remove_callbacks.append(self._availability.add_listener(self._update_availability))
 
     def register_entry(
         self, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -80,64 +110,166 @@ class LightManager:
             gateway_ip=entry_data.get(CONF_GATEWAY_IP),
             gateway_type=entry_data.get(CONF_GATEWAY_TYPE),
             hardware_version=entry_data.get(CONF_GATEWAY_HW_VERSION),
+            features=entry_data.get(CONF_GATEWAY_FEATURES, frozenset()),
+            optimistic_timeout=(
+                entry.options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT)
+                if entry.options.get(CONF_OPTIMISTIC)
+                else None
+            ),
             async_add_entities=async_add_entities,
+            pending=EntityBatcher(self._hass, async_add_entities),
+            cache=entry_data["device_cache"],
         )
         self._contexts[entry.entry_id] = context
+        if context.gateway_mac:
+            self._contexts_by_mac[normalize_mac(context.gateway_mac)] = context
         entry.async_on_unload(lambda: self.unregister_entry(entry.entry_id))
 
+        # Recreate the lights known from the last run without waiting for the
+        # gateway to announce them again.
+        for unique_id, record in context.cache.records("light").items():
+            if unique_id not in self._entities:
+                self._create_entity(
+                    context, LightRegisterMessage.from_data("light_register", record)
+                )
+        context.pending.flush()
+
+        if FEATURE_GROUPS in context.features:
+            self._setup_groups(context, entry.options.get(CONF_LIGHT_GROUPS) or [])
+
+    def _setup_groups(self, context: LightEntryContext, groups: list[dict[str, Any]]) -> None:
+        entities = []
+        for group in groups:
+            entity = BHKLightGroupEntity(context, group, self._entities)
+            self._groups[entity.unique_id] = entity
+            self._group_index.add(entity.unique_id, entity, context.entry_id, entity.gateway_mac)
+            for member in entity.members:
+                self._groups_by_member.setdefault(member, []).append(entity)
+            entities.append(entity)
+        if entities:
+            context.async_add_entities(entities)
+
+        # The gateway stores the groups; send the full set so it also drops
+        # groups removed in the options.
+        if context.gateway_ip:
+            payload = {
+                "type": "group_sync",
+                "target_mac": context.gateway_mac,
+                "groups": [
+                    {
+                        "group": group["id"],
+                        "members": [
+                            {"dest": member["dest"], "ep": member["endpoint"]}
+                            for member in group["members"]
+                        ],
+                    }
+                    for group in groups
+                ],
+            }
+            self._hass.async_create_task(
+                async_send_udp_command(
+                    self._hass, context.gateway_ip, payload, priority=PRIORITY_BACKGROUND
+                )
+            )
+
+    def group_candidates(self, entry_id: str) -> dict[str, BHKLightEntity]:
+        """Lights of an entry that can be put in a gateway group."""
+        return {
+            unique_id: entity
+            for unique_id, entity in self._entities.items()
+            if entity.entry_id == entry_id and entity.device_id and entity.endpoint is not None
+        }
+
     def unregister_entry(self, entry_id: str) -> None:
-        self._contexts.pop(entry_id, None)
-        for unique_id in [
-            uid for uid, entity in self._entities.items() if entity.entry_id == entry_id
-        ]:
-            self._entities.pop(unique_id)
+        context = self._contexts.pop(entry_id, None)
+        if context is not None:
+            context.pending.cancel()
+            gateway = normalize_mac(context.gateway_mac) if context.gateway_mac else None
+            if gateway and self._contexts_by_mac.get(gateway) is context:
+                del self._contexts_by_mac[gateway]
+        for unique_id in self._entity_index.ids_for_entry(entry_id):
+            entity = self._entities.pop(unique_id)
+            self._entity_index.remove(unique_id)
+            if dev_id := _report_device_id(entity):
+                self._router.release(dev_id, self)
+                self._report_parsers.pop(dev_id, None)
+        for unique_id in self._group_index.ids_for_entry(entry_id):
+            group = self._groups.pop(unique_id)
+            self._group_index.remove(unique_id)
+            for member in group.members:
+                members_groups = self._groups_by_member.get(member, [])
+                if group in members_groups:
+                    members_groups.remove(group)
+                if not members_groups:
+                    self._groups_by_member.pop(member, None)
 
         if not self._contexts:
             for remove in self._remove_callbacks:
                 remove()
             self._remove_callbacks.clear()
-            if self._watchdog_unsub:
-                self._watchdog_unsub()
-                self._watchdog_unsub = None
+            self._router.unregister_platform(self)
             self._hass.data[DOMAIN].pop("light_manager", None)
 
     @callback
-    def _handle_register(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = data.get("unique_id") or data.get("mac")
+    def _handle_register(self, message: LightRegisterMessage) -> None:
+        data = message.data
+        unique_id = message.unique_id
         if not unique_id:
-            _LOGGER.debug("Ignoring register payload without unique_id: %s", payload)
+            _LOGGER.debug("Ignoring register payload without unique_id: %s", data)
             return
 
         if unique_id in self._entities:
-            self._entities[unique_id].update_from_register(payload)
+            entity = self._entities[unique_id]
+            entity.update_from_register(message)
+            self._claim(entity, message.device_type)
+            self._remember(entity)
             return
 
-        context = self._resolve_context(data.get("gateway_mac"))
+        context = self._resolve_context(message.gateway_mac)
         if context is None:
             _LOGGER.debug("No entry context available; cannot create light %s", unique_id)
             return
 
-        entity = BHKLightEntity(context, payload)
+        self._remember(self._create_entity(context, message))
+
+    def _create_entity(
+        self, context: LightEntryContext, message: LightRegisterMessage
+    ) -> BHKLightEntity:
+        unique_id = message.unique_id
+        entity = BHKLightEntity(context, message)
         self._entities[unique_id] = entity
-        context.async_add_entities([entity])
+        self._entity_index.add(unique_id, entity, context.entry_id, entity.gateway_mac)
+        self._claim(entity, message.device_type)
+        if entity.gateway_mac and not self._availability.is_available(
+            normalize_mac(entity.gateway_mac)
+        ):
+            entity.set_available(False)
+        context.pending.add(entity)
+
+        if message.state is not None:
+            entity.process_state(message)
+        self._refresh_groups(unique_id)
+        return entity
+
+    def _claim(self, entity: BHKLightEntity, device_type: str | None) -> None:
+        dev_id = _report_device_id(entity)
+        if not dev_id:
+            return
+        self._router.claim(dev_id, self)
+        if device_type and (handler := DEVICE_TYPES.lookup(device_type)):
+            self._report_parsers[dev_id] = handler.parse_report
 
-        if "state" in data:
-            entity.process_state(payload)
+    def _remember(self, entity: BHKLightEntity) -> None:
+        if context := self._contexts.get(entity.entry_id):
+            context.cache.remember("light", entity)
 
     @callback
-    def _handle_device_join(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        device_type = data.get("device_type") or ""
-        dev_id = data.get("device_id") or data.get("id") or ""
-        if not dev_id:
-            _LOGGER.debug("device_join missing id: %s", payload)
-            return
-        # Only handle our light type
-        if "3lights" not in str(device_type).lower():
-            return
-        gateway_mac = data.get("gateway_mac")
-        for ep_val in range(1, 4):
+    def handle_device_join(self, message: DeviceJoinMessage, handler: DeviceHandler) -> None:
+        device_type = message.device_type
+        dev_id = message.device_id
+        gateway_mac = message.gateway_mac
+        # _claim gives every light registered here the handler's report parser.
+        for ep_val in range(1, handler.endpoints + 1):
             unique_id = f"{dev_id}_{ep_val}"
             name = f"Light {ep_val}"
             register_payload = {
@@ -149,38 +281,49 @@ class LightManager:
                 "endpoint": ep_val,
                 "device_type": device_type,
             }
-            self._handle_register(register_payload)
+            self._handle_register(
+                LightRegisterMessage.from_data("light_register", register_payload)
+            )
 
-    @callback
-    def _handle_device_report(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        dev_id = data.get("device_id") or data.get("id")
-        report = data.get("payload") or ""
-        if not dev_id or not isinstance(report, str):
-            return
-        if "_" not in report:
-            return
-        ep_str, state_str = report.split("_", 1)
-        try:
-            ep_val = int(ep_str)
-        except ValueError:
-            return
+    def write_reports(self, entities: Iterable[BHKLightEntity]) -> None:
+        groups: dict[str, BHKLightGroupEntity] = {}
+        for entity in entities:
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+            self._remember(entity)
+            for group in self._groups_by_member.get(entity.unique_id, ()):
+                groups[group.unique_id] = group
+        for group in groups.values():
+            group.async_refresh()
+
+    def _refresh_groups(self, unique_id: str) -> None:
+        for group in self._groups_by_member.get(unique_id, ()):
+            group.async_refresh()
+
+    def apply_device_report(self, message: DeviceReportMessage) -> BHKLightEntity | None:
+        """Apply a device report; return the entity if its state changed."""
+        dev_id = message.device_id
+        if not dev_id:
+            return None
+        parse = self._report_parsers.get(dev_id, parse_endpoint_report)
+        parsed = parse(message.payload or "")
+        if parsed is None or parsed[0] is None:
+            return None
+        ep_val, state_str = parsed
         unique_id = f"{dev_id}_{ep_val}"
         entity = self._entities.get(unique_id)
         if not entity:
-            return
-        state = state_str.lower()
-        state_payload = {"state": "on" if state == "on" else "off"}
-        entity.process_state(state_payload)
+            return None
+        changed = entity.report_is_on(state_str.lower() == "on")
         if entity.set_available(True):
-            entity.async_write_ha_state()
+            changed = True
+        return entity if changed else None
 
     @callback
-    def _handle_state(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = data.get("unique_id") or data.get("mac")
+    def _handle_state(self, message: LightStateMessage) -> None:
+        unique_id = message.unique_id
         if not unique_id:
-            _LOGGER.debug("Ignoring state payload without unique_id: %s", payload)
+            _LOGGER.debug("Ignoring state payload without unique_id: %s", message.data)
             return
 
         entity = self._entities.get(unique_id)
@@ -188,58 +331,60 @@ class LightManager:
             _LOGGER.debug("State update received for unknown light %s", unique_id)
             return
 
-        entity.process_state(payload)
+        entity.process_state(message)
+        self._remember(entity)
+        self._refresh_groups(unique_id)
 
-    @callback
-    @callback
-    def _handle_gateway_alive(self, payload: dict[str, Any]) -> None:
-        gw_mac = payload.get("mac") or payload.get("gateway_mac")
-        if not gw_mac:
-            return
-        self._last_alive[gw_mac.lower()] = datetime.utcnow()
-        self._update_availability(gw_mac, True)
-
-    @callback
-    def _watchdog(self, _now) -> None:
-        cutoff = datetime.utcnow() - timedelta(seconds=GATEWAY_ALIVE_TIMEOUT)
-        for gw_mac, ts in list(self._last_alive.items()):
-            available = ts >= cutoff
-            self._update_availability(gw_mac, available)
-
-    def _update_availability(self, gateway_mac: str, available: bool) -> None:
-        gw = gateway_mac.lower()
-        for entity in self._entities.values():
-            if entity.gateway_mac and entity.gateway_mac.lower() == gw:
-                if entity.set_available(available):
-                    entity.async_write_ha_state()
+    def _update_availability(self, gateway: str, available: bool) -> None:
+        for entity in self._entity_index.for_gateway(gateway):
+            if entity.set_available(available) and entity.hass is not None:
+                entity.async_write_ha_state()
+        for group in self._group_index.for_gateway(gateway):
+            group.async_refresh()
 
     def _resolve_context(self, gateway_mac: str | None) -> LightEntryContext | None:
         if gateway_mac:
-            for context in self._contexts.values():
-                if context.gateway_mac and context.gateway_mac.lower() == gateway_mac.lower():
-                    return context
+            context = self._contexts_by_mac.get(normalize_mac(gateway_mac))
+            if context is not None:
+                return context
         return next(iter(self._contexts.values()), None)
 
 
+def _report_device_id(entity: BHKLightEntity) -> str | None:
+    """The device_id reports for ``entity`` carry.
+
+    A register may give only the unique_id; reports then match its
+    "<device_id>_<endpoint>" form.
+    """
+    if entity.device_id:
+        return entity.device_id
+    dev_id, sep, endpoint = entity.unique_id.rpartition("_")
+    return dev_id if sep and dev_id and endpoint.isdigit() else None
+
+
 class BHKLightEntity(LightEntity):
     _attr_should_poll = False
     _attr_supported_color_modes = {ColorMode.ONOFF}
     _attr_color_mode = ColorMode.ONOFF
 
-    def __init__(self, context: LightEntryContext, payload: dict[str, Any]) -> None:
+    def __init__(self, context: LightEntryContext, message: LightRegisterMessage) -> None:
         self.entry_id = context.entry_id
-        normalized = {str(k).lower(): v for k, v in payload.items()}
-        unique_id = normalized.get("unique_id") or normalized.get("mac")
+        unique_id = message.unique_id
         self._attr_unique_id = unique_id
-        self._gateway_mac = normalized.get("gateway_mac") or context.gateway_mac
+        self._gateway_mac = message.gateway_mac or context.gateway_mac
         self._gateway_ip = context.gateway_ip
         self._gateway_type = context.gateway_type
         self._hardware_version = context.hardware_version
+        self._binary = FEATURE_BINARY in context.features
+        self._coalesce = FEATURE_MULTI_COMMAND in context.features
+        self._optimistic_timeout = context.optimistic_timeout
+        self._assumed_from = False
+        self._cancel_rollback: CALLBACK_TYPE | None = None
         self._is_on = False
-        self._id = normalized.get("id") or normalized.get("ieee")
-        self._endpoint = normalized.get("endpoint")
-        self._device_type = normalized.get("device_type")
-        self._attr_name = payload.get("name") or f"Light {unique_id}"
+        self._id = message.device_id
+        self._endpoint = message.endpoint
+        self._device_type = message.device_type
+        self._attr_name = message.name or f"Light {unique_id}"
         self._attr_available = True
         if self._gateway_mac:
             self._attr_device_info = DeviceInfo(
@@ -256,27 +401,65 @@ class BHKLightEntity(LightEntity):
     def is_on(self) -> bool:
         return self._is_on
 
-    def update_from_register(self, payload: dict[str, Any]) -> None:
-        name = payload.get("name")
+    def update_from_register(self, message: LightRegisterMessage) -> None:
+        name = message.name
         if name and name != self._attr_name:
             self._attr_name = name
+            if self.hass is not None:
+                self.async_write_ha_state()
+        if message.device_id:
+            self._id = message.device_id
+        if message.endpoint is not None:
+            self._endpoint = message.endpoint
+        if message.device_type:
+            self._device_type = message.device_type
+
+    def process_state(self, message: LightRegisterMessage) -> None:
+        if self.report_is_on(message.state == "on") and self.hass is not None:
+            self.async_write_ha_state()
+
+    def set_is_on(self, is_on: bool) -> bool:
+        if is_on == self._is_on:
+            return False
+        self._is_on = is_on
+        return True
+
+    def report_is_on(self, is_on: bool) -> bool:
+        """Apply the state reported by the device, ending any optimistic state."""
+        if self._cancel_rollback is not None:
+            self._cancel_rollback()
+            self._cancel_rollback = None
+        return self.set_is_on(is_on)
+
+    @property
+    def optimistic(self) -> bool:
+        return bool(self._optimistic_timeout)
+
+    @callback
+    def assume_is_on(self, is_on: bool) -> None:
+        """Show a commanded state until a report settles it or the timeout reverts it."""
+        if self._cancel_rollback is None:
+            self._assumed_from = self._is_on
+        else:
+            self._cancel_rollback()
+        self._cancel_rollback = async_call_later(
+            self.hass, self._optimistic_timeout, self._async_rollback
+        )
+        if self.set_is_on(is_on):
             self.async_write_ha_state()
-        normalized = {str(k).lower(): v for k, v in payload.items()}
-        if normalized.get("id"):
-            self._id = normalized.get("id")
-        if normalized.get("endpoint") is not None:
-            self._endpoint = normalized.get("endpoint")
-        if normalized.get("device_type"):
-            self._device_type = normalized.get("device_type")
-
-    def process_state(self, payload: dict[str, Any]) -> None:
-        data = {str(k).lower(): v for k, v in payload.items()}
-        state = str(data.get("state", "")).lower()
-        new_state = state == "on"
-        if new_state != self._is_on:
-            self._is_on = new_state
+
+    @callback
+    def _async_rollback(self, _now) -> None:
+        self._cancel_rollback = None
+        _LOGGER.debug("No report for %s; reverting optimistic state", self._attr_unique_id)
+        if self.set_is_on(self._assumed_from):
             self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        if self._cancel_rollback is not None:
+            self._cancel_rollback()
+            self._cancel_rollback = None
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self._async_send_command("ON")
 
@@ -307,14 +490,145 @@ class BHKLightEntity(LightEntity):
             GATEWAY_COMMAND_PORT,
             payload,
         )
-        await async_send_udp_command(self.hass, self._gateway_ip, payload)
+        await async_send_udp_command(
+            self.hass,
+            self._gateway_ip,
+            payload,
+            binary=self._binary,
+            coalesce=self._coalesce,
+        )
+        if self._optimistic_timeout:
+            self.assume_is_on(state == "ON")
 
     @property
     def gateway_mac(self) -> str | None:
         return self._gateway_mac
 
+    @property
+    def device_id(self) -> str | None:
+        return self._id
+
+    @property
+    def endpoint(self) -> Any:
+        return self._endpoint
+
+    def as_cache_record(self) -> dict[str, Any]:
+        # The last reported state, not one assumed while a command is unconfirmed.
+        is_on = self._assumed_from if self._cancel_rollback is not None else self._is_on
+        return {
+            "unique_id": self._attr_unique_id,
+            "name": self._attr_name,
+            "gateway_mac": self._gateway_mac,
+            "id": self._id,
+            "endpoint": self._endpoint,
+            "device_type": self._device_type,
+            "state": "on" if is_on else "off",
+        }
+
     def set_available(self, available: bool) -> bool:
         if self._attr_available == available:
             return False
         self._attr_available = available
         return True
+
+
+class BHKLightGroupEntity(LightEntity):
+    """A light group stored on the gateway and switched with one group command.
+
+    Members keep their own state from their device reports; the group is on
+    when any member is on and available when any member is.
+    """
+
+    _attr_should_poll = False
+    _attr_supported_color_modes = {ColorMode.ONOFF}
+    _attr_color_mode = ColorMode.ONOFF
+
+    def __init__(
+        self,
+        context: LightEntryContext,
+        group: dict[str, Any],
+        lights: dict[str, BHKLightEntity],
+    ) -> None:
+        self.entry_id = context.entry_id
+        self._group_id = int(group["id"])
+        self._lights = lights
+        self.members = [member["unique_id"] for member in group["members"]]
+        self._gateway_mac = context.gateway_mac
+        self._gateway_ip = context.gateway_ip
+        self._attr_unique_id = f"{context.gateway_mac}_group_{self._group_id}"
+        self._attr_name = group.get("name") or f"Group {self._group_id}"
+        self._attr_extra_state_attributes = {"group_id": self._group_id}
+        self._is_on = False
+        self._attr_available = False
+        if self._gateway_mac:
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, self._gateway_mac)},
+                manufacturer="BHK-SOLUTIONS",
+                name=f"Gateway {self._gateway_mac}",
+                model=context.gateway_type,
+                hw_version=context.hardware_version,
+            )
+        else:
+            self._attr_device_info = None
+        self.refresh()
+
+    @property
+    def is_on(self) -> bool:
+        return self._is_on
+
+    @property
+    def gateway_mac(self) -> str | None:
+        return self._gateway_mac
+
+    async def async_added_to_hass(self) -> None:
+        # Members may have reported while the group was being added.
+        self.refresh()
+
+    @callback
+    def async_refresh(self) -> None:
+        if self.refresh() and self.hass is not None:
+            self.async_write_ha_state()
+
+    def refresh(self) -> bool:
+        """Recompute state from the members; return True if it changed."""
+        lights = [self._lights[uid] for uid in self.members if uid in self._lights]
+        is_on = any(light.is_on for light in lights)
+        available = any(light.available for light in lights)
+        if is_on == self._is_on and available == self._attr_available:
+            return False
+        self._is_on = is_on
+        self._attr_available = available
+        return True
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_send_command("ON")
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_send_command("OFF")
+
+    async def _async_send_command(self, state: str) -> None:
+        if not self._gateway_ip:
+            _LOGGER.warning(
+                "Cannot send command for %s; gateway IP unknown", self._attr_unique_id
+            )
+            return
+
+        payload = {
+            "type": "group_cmd",
+            "target_mac": self._gateway_mac,
+            "group": self._group_id,
+            "com": state,
+        }
+        _LOGGER.info(
+            "Sending group command for %s to %s:%s -> %s",
+            self._attr_unique_id,
+            self._gateway_ip,
+            GATEWAY_COMMAND_PORT,
+            payload,
+        )
+        await async_send_udp_command(self.hass, self._gateway_ip, payload)
+        for unique_id in self.members:
+            light = self._lights.get(unique_id)
+            if light is not None and light.optimistic and light.hass is not None:
+                light.assume_is_on(state == "ON")
+        self.async_refresh()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from .codec import decode_frame, is_frame
+from .const import (
+    SIGNAL_COMMAND_ACK,
+    SIGNAL_COVER_REGISTER,
+    SIGNAL_COVER_STATE,
+    SIGNAL_DEVICE_JOIN,
+    SIGNAL_DEVICE_REPORT,
+    SIGNAL_GATEWAY_ALIVE,
+    SIGNAL_JOIN_WINDOW,
+    SIGNAL_LIGHT_REGISTER,
+    SIGNAL_LIGHT_STATE,
+    SIGNAL_ZB_REPORT,
+)
+
+
+def _lower_state(data: dict[str, Any]) -> str | None:
+    state = data.get("state")
+    return None if state is None else str(state).lower()
+
+
+def _number(value: Any) -> float | None:
+    """Return a finite JSON number as float; None for anything else (NaN, inf, strings)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = float(value)
+        if math.isfinite(value):
+            return value
+    return None
+
+
+def _seconds(value: Any) -> float | None:
+    value = _number(value)
+    return value if value is not None and value > 0 else None
+
+
+def _percent(value: Any) -> int | None:
+    value = _number(value)
+    return None if value is None else max(0, min(100, int(value)))
+
+
+@dataclass(slots=True)
+class GatewayMessage:
+    """A gateway datagram normalized once at ingress.
+
+    Keys are lower-cased and the fields consumers need are extracted when
+    the message is built; the same instance is then handed to every
+    subscriber, which must treat it (including ``data``) as read-only. It is
+    not frozen: that would route every field set in ``__init__`` through
+    ``object.__setattr__`` and cost about a quarter of the receive rate.
+    """
+
+    signal: ClassVar[str]
+
+    type: str
+    data: dict[str, Any]
+    gateway_mac: str | None
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        return cls(msg_type, data, data.get("gateway_mac"))
+
+
+@dataclass(slots=True)
+class LightRegisterMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_LIGHT_REGISTER
+
+    unique_id: str | None
+    name: str | None
+    device_id: str | None
+    endpoint: Any
+    device_type: str | None
+    state: str | None
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        return cls(
+            msg_type,
+            data,
+            data.get("gateway_mac"),
+            data.get("unique_id") or data.get("mac"),
+            data.get("name"),
+            data.get("id") or data.get("ieee"),
+            data.get("endpoint"),
+            data.get("device_type"),
+            _lower_state(data),
+        )
+
+
+@dataclass(slots=True)
+class LightStateMessage(LightRegisterMessage):
+    signal: ClassVar[str] = SIGNAL_LIGHT_STATE
+
+
+@dataclass(slots=True)
+class CoverRegisterMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_COVER_REGISTER
+
+    unique_id: str | None
+    name: str | None
+    device_id: str | None
+    state: str | None
+    position: int | None
+    open_time: float | None
+    close_time: float | None
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        device_id = data.get("device_id") or data.get("id")
+        return cls(
+            msg_type,
+            data,
+            data.get("gateway_mac"),
+            data.get("unique_id") or device_id or data.get("mac"),
+            data.get("name"),
+            device_id,
+            _lower_state(data),
+            _percent(data.get("position")),
+            _seconds(data.get("open_time")),
+            _seconds(data.get("close_time")),
+        )
+
+
+@dataclass(slots=True)
+class CoverStateMessage(CoverRegisterMessage):
+    signal: ClassVar[str] = SIGNAL_COVER_STATE
+
+
+@dataclass(slots=True)
+class DeviceJoinMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_DEVICE_JOIN
+
+    device_id: str | None
+    device_type: str
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        return cls(
+            msg_type,
+            data,
+            data.get("gateway_mac"),
+            data.get("device_id") or data.get("id"),
+            str(data.get("device_type") or ""),
+        )
+
+
+@dataclass(slots=True)
+class DeviceReportMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_DEVICE_REPORT
+
+    device_id: str | None
+    payload: str | None
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        report = data.get("payload")
+        return cls(
+            msg_type,
+            data,
+            data.get("gateway_mac"),
+            data.get("device_id") or data.get("id"),
+            report if isinstance(report, str) else None,
+        )
+
+
+@dataclass(slots=True)
+class ZigbeeReportMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_ZB_REPORT
+
+
+@dataclass(slots=True)
+class GatewayAliveMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_GATEWAY_ALIVE
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        return cls(msg_type, data, data.get("mac") or data.get("gateway_mac"))
+
+
+@dataclass(slots=True)
+class JoinWindowMessage(GatewayAliveMessage):
+    signal: ClassVar[str] = SIGNAL_JOIN_WINDOW
+
+
+@dataclass(slots=True)
+class CommandAckMessage(GatewayMessage):
+    signal: ClassVar[str] = SIGNAL_COMMAND_ACK
+
+    req_id: Any
+
+    @classmethod
+    def from_data(cls, msg_type: str, data: dict[str, Any]) -> GatewayMessage:
+        return cls(msg_type, data, data.get("gateway_mac"), data.get("req_id"))
+
+
+MESSAGE_TYPES: dict[str, type[GatewayMessage]] = {
+    "light_register": LightRegisterMessage,
+    "light_state": LightStateMessage,
+    "cover_register": CoverRegisterMessage,
+    "cover_state": CoverStateMessage,
+    "device_join": DeviceJoinMessage,
+    "device_report": DeviceReportMessage,
+    "zigbee_report": ZigbeeReportMessage,
+    "gateway_alive": GatewayAliveMessage,
+    "join_window": JoinWindowMessage,
+    "cmd_ack": CommandAckMessage,
+}
+
+
+def decode_datagram(data: bytes) -> dict[str, Any] | None:
+    """Decode a JSON datagram or binary frame into a dict with lower-case keys."""
+
+    if is_frame(data):
+        return decode_frame(data)
+    try:
+        payload = json.loads(data.decode())
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    # JSON object keys are always strings, and gateways normally send them
+    # in lower case already: only rebuild the dict when one of them is not.
+    for key in payload:
+        if not key.islower():
+            return {key.lower(): value for key, value in payload.items()}
+    return payload
+
+
+def build_message(data: dict[str, Any]) -> GatewayMessage | None:
+    """Turn normalized datagram data into its typed message, if the type is known."""
+
+    msg_type = data.get("type")
+    message_cls = MESSAGE_TYPES.get(msg_type) if isinstance(msg_type, str) else None
+    if message_cls is None:
+        # Gateways normally send lower-case types; only pay for the
+        # conversion when the fast lookup misses.
+        msg_type = str(msg_type or "").lower()
+        message_cls = MESSAGE_TYPES.get(msg_type)
+        if message_cls is None:
+            return None
+    return message_cls.from_data(msg_type, data)
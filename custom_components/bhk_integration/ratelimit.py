@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .const import (
+    RATE_LIMIT_DEVICE_BURST,
+    RATE_LIMIT_DEVICE_PER_SECOND,
+    RATE_LIMIT_GATEWAY_BURST,
+    RATE_LIMIT_GATEWAY_PER_SECOND,
+    RATE_LIMIT_MAX_BUCKETS,
+    RATE_LIMIT_MAX_PENDING,
+)
+from .messages import GatewayMessage
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+
+class ReportRateLimiter:
+    """Token buckets per gateway and per device for state reports.
+
+    A report that finds either bucket empty is parked in a per-slot pending
+    table (one slot per device endpoint) where a newer report replaces it,
+    so a flooding device only ever has its latest value delivered once
+    tokens are available again.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        deliver: Callable[[GatewayMessage], None],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loop = loop
+        self._deliver = deliver
+        self._clock = clock
+        # Least recently used first; the oldest bucket is evicted at the cap.
+        self._gateway_buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+        self._device_buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+        self._pending: dict[Hashable, tuple[Hashable, Hashable, GatewayMessage]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.admitted = 0
+        self.deferred = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _bucket(
+        self,
+        buckets: OrderedDict[Hashable, TokenBucket],
+        key: Hashable,
+        rate: float,
+        burst: float,
+        now: float,
+    ) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= RATE_LIMIT_MAX_BUCKETS:
+                buckets.popitem(last=False)
+            bucket = buckets[key] = TokenBucket(rate, burst, now)
+        else:
+            buckets.move_to_end(key)
+        return bucket
+
+    def _take(self, gateway: Hashable, device: Hashable, now: float) -> bool:
+        gateway_bucket = self._bucket(
+            self._gateway_buckets,
+            gateway,
+            RATE_LIMIT_GATEWAY_PER_SECOND,
+            RATE_LIMIT_GATEWAY_BURST,
+            now,
+        )
+        device_bucket = self._bucket(
+            self._device_buckets,
+            device,
+            RATE_LIMIT_DEVICE_PER_SECOND,
+            RATE_LIMIT_DEVICE_BURST,
+            now,
+        )
+        if gateway_bucket.refill(now) < 1 or device_bucket.refill(now) < 1:
+            return False
+        gateway_bucket.tokens -= 1
+        device_bucket.tokens -= 1
+        return True
+
+    def submit(
+        self, message: GatewayMessage, gateway: Hashable, device: Hashable, slot: Hashable
+    ) -> bool:
+        """Return True if the message may be delivered now; otherwise it is parked."""
+
+        if slot in self._pending:
+            # An older value for this endpoint is still waiting: keep the newest.
+            self._pending[slot] = (gateway, device, message)
+            self.coalesced += 1
+            return False
+
+        if self._take(gateway, device, self._clock()):
+            self.admitted += 1
+            return True
+
+        if len(self._pending) >= RATE_LIMIT_MAX_PENDING:
+            self.dropped += 1
+            return False
+        self._pending[slot] = (gateway, device, message)
+        self._schedule_flush()
+        return False
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(
+                1 / RATE_LIMIT_DEVICE_PER_SECOND, self._flush
+            )
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        now = self._clock()
+        for slot, (gateway, device, message) in list(self._pending.items()):
+            if not self._take(gateway, device, now):
+                continue
+            del self._pending[slot]
+            self.deferred += 1
+            self._deliver(message)
+        if self._pending:
+            self._schedule_flush()
+
+    def cancel(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "admitted": self.admitted,
+            "deferred": self.deferred,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "pending": len(self._pending),
+        }
+
+
+class CommandCollapser:
+    """Minimum interval between commands to one device endpoint, newest wins.
+
+    A command arriving within the interval of the previous one waits in the
+    endpoint's pending slot; a newer command replaces it there, so while a
+    position slider is dragged only the latest target is transmitted.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        interval: float,
+        send: Callable[[Any, dict[str, Any]], None],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loop = loop
+        self._interval = interval
+        self._send = send
+        self._clock = clock
+        self._last_sent: OrderedDict[Hashable, float] = OrderedDict()
+        self._pending: dict[Hashable, tuple[Any, dict[str, Any]]] = {}
+        self._handles: dict[Hashable, asyncio.TimerHandle] = {}
+        self.passed = 0
+        self.deferred = 0
+        self.collapsed = 0
+
+    def submit(self, slot: Hashable, target: Any, payload: dict[str, Any]) -> bool:
+        """Return True if the command may be sent now; otherwise it is parked."""
+
+        if slot in self._pending:
+            self._pending[slot] = (target, payload)
+            self.collapsed += 1
+            return False
+
+        now = self._clock()
+        wait = self._interval - (now - self._last_sent.get(slot, -self._interval))
+        if wait <= 0:
+            self._mark_sent(slot, now)
+            self.passed += 1
+            return True
+
+        self._pending[slot] = (target, payload)
+        self._handles[slot] = self._loop.call_later(wait, self._flush, slot)
+        return False
+
+    def _mark_sent(self, slot: Hashable, now: float) -> None:
+        last_sent = self._last_sent
+        if slot in last_sent:
+            last_sent.move_to_end(slot)
+        elif len(last_sent) >= RATE_LIMIT_MAX_BUCKETS:
+            last_sent.popitem(last=False)
+        last_sent[slot] = now
+
+    def _flush(self, slot: Hashable) -> None:
+        self._handles.pop(slot, None)
+        target, payload = self._pending.pop(slot)
+        self._mark_sent(slot, self._clock())
+        self.deferred += 1
+        self._send(target, payload)
+
+    def cancel(self) -> None:
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._pending.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "interval": self._interval,
+            "passed": self.passed,
+            "deferred": self.deferred,
+            "collapsed": self.collapsed,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_DEVICE_JOIN, SIGNAL_DEVICE_REPORT, SIGNAL_MESSAGE_BATCH
+from .devices import DEVICE_TYPES, DeviceHandler
+from .messages import DeviceJoinMessage, DeviceReportMessage, GatewayMessage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DevicePlatform(Protocol):
+    """What a platform manager provides to the router."""
+
+    platform: str
+    batch_handlers: dict[str, Callable[[Any], None]]
+
+    def handle_device_join(self, message: DeviceJoinMessage, handler: DeviceHandler) -> None: ...
+
+    def apply_device_report(self, message: DeviceReportMessage) -> Any | None:
+        """Apply a report without writing state; return the entity if it changed."""
+
+    def write_reports(self, entities: Iterable[Any]) -> None: ...
+
+
+def get_router(hass: HomeAssistant) -> DeviceRouter:
+    router: DeviceRouter | None = hass.data[DOMAIN].get("device_router")
+    if router is None:
+        router = hass.data[DOMAIN]["device_router"] = DeviceRouter(hass)
+    return router
+
+
+class DeviceRouter:
+    """Single subscriber for device_join and device_report messages.
+
+    Every device a platform creates entities for is claimed by it, so a
+    report reaches its owner with one dict lookup however many platforms
+    are loaded. A join goes to the platform named by the DeviceHandler its
+    device_type maps to in DEVICE_TYPES. In batch mode the router also hands
+    the platforms' own register/state messages to them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._platforms: dict[str, DevicePlatform] = {}
+        self._owners: dict[str, DevicePlatform] = {}
+        self._batch_handlers: dict[str, Callable[[Any], None]] = {}
+        self.routed = 0
+        self.unrouted = 0
+        self.unknown_types = 0
+        self._remove_callbacks = [
+            async_dispatcher_connect(hass, SIGNAL_DEVICE_JOIN, self._handle_device_join),
+            async_dispatcher_connect(hass, SIGNAL_DEVICE_REPORT, self._handle_device_report),
+            async_dispatcher_connect(hass, SIGNAL_MESSAGE_BATCH, self._handle_batch),
+        ]
+
+    def register_platform(self, platform: DevicePlatform) -> None:
+        self._platforms[platform.platform] = platform
+        self._batch_handlers.update(platform.batch_handlers)
+
+    def unregister_platform(self, platform: DevicePlatform) -> None:
+        del self._platforms[platform.platform]
+        for device_id in [d for d, owner in self._owners.items() if owner is platform]:
+            del self._owners[device_id]
+        self._batch_handlers = {
+            signal: handler
+            for other in self._platforms.values()
+            for signal, handler in other.batch_handlers.items()
+        }
+        if not self._platforms:
+            for remove in self._remove_callbacks:
+                remove()
+            self._remove_callbacks.clear()
+            self._hass.data[DOMAIN].pop("device_router", None)
+
+    def claim(self, device_id: str, platform: DevicePlatform) -> None:
+        self._owners[device_id] = platform
+
+    def release(self, device_id: str, platform: DevicePlatform) -> None:
+        if self._owners.get(device_id) is platform:
+            del self._owners[device_id]
+
+    @callback
+    def _handle_device_join(self, message: DeviceJoinMessage) -> None:
+        if not message.device_id:
+            _LOGGER.debug("device_join missing id: %s", message.data)
+            return
+        handler = DEVICE_TYPES.lookup(message.device_type)
+        platform = self._platforms.get(handler.platform) if handler else None
+        if platform is None:
+            self.unknown_types += 1
+            _LOGGER.debug(
+                "No platform handles device type %r of %s", message.device_type, message.device_id
+            )
+            return
+        platform.handle_device_join(message, handler)
+
+    def _route_report(self, message: DeviceReportMessage) -> tuple[DevicePlatform, Any] | None:
+        owner = self._owners.get(message.device_id) if message.device_id else None
+        if owner is None or message.payload is None:
+            self.unrouted += 1
+            _LOGGER.debug("Device report received for unknown device %s", message.device_id)
+            return None
+        self.routed += 1
+        entity = owner.apply_device_report(message)
+        return None if entity is None else (owner, entity)
+
+    @callback
+    def _handle_device_report(self, message: DeviceReportMessage) -> None:
+        if routed := self._route_report(message):
+            routed[0].write_reports(routed[1:])
+
+    @callback
+    def _handle_batch(self, messages: list[GatewayMessage]) -> None:
+        # Reports are applied in order but each entity is written once per batch.
+        changed: dict[DevicePlatform, dict[int, Any]] = {}
+        for message in messages:
+            if isinstance(message, DeviceReportMessage):
+                if routed := self._route_report(message):
+                    owner, entity = routed
+                    changed.setdefault(owner, {})[id(entity)] = entity
+            elif isinstance(message, DeviceJoinMessage):
+                self._handle_device_join(message)
+            elif handler := self._batch_handlers.get(message.signal):
+                handler(message)
+        for platform, entities in changed.items():
+            platform.write_reports(entities.values())
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "platforms": len(self._platforms),
+            "devices": len(self._owners),
+            "routed": self.routed,
+            "unrouted": self.unrouted,
+            "unknown_types": self.unknown_types,
+        }
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from .const import PRIORITY_BACKGROUND, SEND_QUEUE_MAX
+from .ratelimit import TokenBucket
+
+
+class _Queued:
+    __slots__ = ("bind_ip", "addr", "data", "cost", "priority", "queued_at", "on_sent")
+
+    def __init__(
+        self,
+        bind_ip: str,
+        addr: tuple[str, int],
+        data: bytes,
+        cost: int,
+        priority: int,
+        queued_at: float,
+        on_sent: Callable[[], None] | None,
+    ) -> None:
+        self.bind_ip = bind_ip
+        self.addr = addr
+        self.data = data
+        self.cost = cost
+        self.priority = priority
+        self.queued_at = queued_at
+        self.on_sent = on_sent
+
+
+class _GatewayQueue:
+    def __init__(self, rate: float, now: float) -> None:
+        self.bucket = TokenBucket(rate, rate, now)
+        self.queues: tuple[deque[_Queued], ...] = tuple(
+            deque() for _ in range(PRIORITY_BACKGROUND + 1)
+        )
+        self.queued_data: dict[bytes, _Queued] = {}
+        self.handle: asyncio.TimerHandle | None = None
+        self.sent = 0
+        self.queued = 0
+        self.merged = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self.queues)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "queued": self.queued,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "avg_wait_ms": round(self.total_wait / self.queued * 1000, 1) if self.queued else 0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class SendScheduler:
+    """Pace outbound datagrams to each gateway within a command budget.
+
+    Every gateway gets a token bucket of ``rate`` commands per second (a
+    multi-command datagram costs one token per command). Datagrams that
+    find the bucket empty wait in per-priority queues and are released
+    highest priority first as tokens come back, so a scene is not held up
+    behind retransmissions or join-window requests. A datagram identical
+    to one already waiting replaces it at the back of the queue, at the
+    higher of the two priorities: it is sent once, and after the commands
+    queued in between (ON, OFF, ON still ends ON). ``on_sent`` is called when a datagram actually goes out.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        rate: float,
+        send: Callable[[str, bytes, tuple[str, int]], bool],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loop = loop
+        self._rate = rate
+        self._send = send
+        self._clock = clock
+        self._gateways: dict[str, _GatewayQueue] = {}
+
+    def submit(
+        self,
+        bind_ip: str,
+        addr: tuple[str, int],
+        data: bytes,
+        cost: int,
+        priority: int,
+        on_sent: Callable[[], None] | None = None,
+    ) -> bool:
+        """Send now or queue; return False if the datagram had to be dropped."""
+
+        now = self._clock()
+        gateway = self._gateways.get(addr[0])
+        if gateway is None:
+            gateway = self._gateways[addr[0]] = _GatewayQueue(self._rate, now)
+        # A datagram larger than the whole budget still goes out once it is full.
+        cost = min(cost, self._rate)
+
+        if gateway.handle is None and gateway.bucket.refill(now) >= cost:
+            gateway.bucket.tokens -= cost
+            gateway.sent += 1
+            if not self._send(bind_ip, data, addr):
+                return False
+            if on_sent is not None:
+                on_sent()
+            return True
+
+        if (older := gateway.queued_data.pop(data, None)) is not None:
+            gateway.queues[older.priority].remove(older)
+            gateway.merged += 1
+            # A retransmission must not demote an interactive original.
+            priority = min(priority, older.priority)
+            on_sent = on_sent or older.on_sent
+        else:
+            if gateway.depth() >= SEND_QUEUE_MAX and not self._drop_lower(gateway, priority):
+                gateway.dropped += 1
+                return False
+            gateway.queued += 1
+        item = _Queued(bind_ip, addr, data, cost, priority, now, on_sent)
+        gateway.queues[priority].append(item)
+        gateway.queued_data[data] = item
+        gateway.max_depth = max(gateway.max_depth, gateway.depth())
+        if gateway.handle is None:
+            self._schedule(addr[0], gateway, cost, now)
+        return True
+
+    def _drop_lower(self, gateway: _GatewayQueue, priority: int) -> bool:
+        for lower in range(len(gateway.queues) - 1, priority, -1):
+            if gateway.queues[lower]:
+                dropped = gateway.queues[lower].pop()
+                gateway.queued_data.pop(dropped.data, None)
+                gateway.dropped += 1
+                return True
+        return False
+
+    def _schedule(self, host: str, gateway: _GatewayQueue, cost: float, now: float) -> None:
+        delay = max(cost - gateway.bucket.refill(now), 0) / self._rate
+        gateway.handle = self._loop.call_later(delay, self._drain, host)
+
+    def _drain(self, host: str) -> None:
+        gateway = self._gateways[host]
+        gateway.handle = None
+        now = self._clock()
+        tokens = gateway.bucket.refill(now)
+        for queue in gateway.queues:
+            while queue:
+                item = queue[0]
+                if tokens < item.cost:
+                    self._schedule(host, gateway, item.cost, now)
+                    return
+                queue.popleft()
+                gateway.queued_data.pop(item.data, None)
+                tokens = gateway.bucket.tokens = tokens - item.cost
+                wait = now - item.queued_at
+                gateway.total_wait += wait
+                gateway.max_wait = max(gateway.max_wait, wait)
+                gateway.sent += 1
+                if self._send(item.bind_ip, item.data, item.addr) and item.on_sent is not None:
+                    item.on_sent()
+
+    def cancel(self) -> None:
+        for gateway in self._gateways.values():
+            if gateway.handle is not None:
+                gateway.handle.cancel()
+                gateway.handle = None
+            for queue in gateway.queues:
+                queue.clear()
+            gateway.queued_data.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rate": self._rate,
+            "gateways": {host: gateway.as_dict() for host, gateway in self._gateways.items()},
+        }
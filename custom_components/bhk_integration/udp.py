@@ -3,124 +3,997 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
+import selectors
 import socket
+import struct
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
+    BULK_RECEIVE_MAX_DATAGRAMS,
+    COMMAND_BATCH_MAX,
+    COMMAND_CACHE_SIZE,
+    CONF_GATEWAY_IP,
     CONF_LOCAL_BIND_IP,
     DOMAIN,
     GATEWAY_COMMAND_PORT,
     GATEWAY_RESPONSE_PORT,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_RETRY,
+    RECEIVE_DATAGRAM_SIZE,
+    RECEIVE_THREAD_QUEUE_SIZE,
     SIGNAL_COVER_REGISTER,
     SIGNAL_COVER_STATE,
     SIGNAL_DEVICE_JOIN,
     SIGNAL_DEVICE_REPORT,
     SIGNAL_LIGHT_REGISTER,
     SIGNAL_LIGHT_STATE,
-    SIGNAL_ZB_REPORT,
-    SIGNAL_GATEWAY_ALIVE,
-    SIGNAL_JOIN_WINDOW,
+    SIGNAL_MESSAGE_BATCH,
 )
+from .codec import encode_command, is_frame
+from .dedup import DuplicateFilter
+from .delivery import CommandTracker
+from .gateways import GatewayIndex, normalize_mac
+from .messages import (
+    CommandAckMessage,
+    CoverStateMessage,
+    DeviceJoinMessage,
+    DeviceReportMessage,
+    GatewayMessage,
+    JoinWindowMessage,
+    LightStateMessage,
+    build_message,
+    decode_datagram,
+)
+from .ratelimit import CommandCollapser, ReportRateLimiter
+from .scheduler import SendScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Linux reports the socket's cumulative receive-queue drops as ancillary data
+# when this option is set; Python does not export the constant.
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+# Signals consumed by the platform managers; in batch mode these are buffered
+# and delivered together through SIGNAL_MESSAGE_BATCH.
+BATCHED_SIGNALS = frozenset(
+    {
+        SIGNAL_LIGHT_REGISTER,
+        SIGNAL_LIGHT_STATE,
+        SIGNAL_COVER_REGISTER,
+        SIGNAL_COVER_STATE,
+        SIGNAL_DEVICE_JOIN,
+        SIGNAL_DEVICE_REPORT,
+    }
+)
+
+# Commands whose delivery is confirmed and retried when acked delivery is on.
+TRACKED_COMMANDS = frozenset({"device_cmd", "open_join", "group_cmd", "group_sync"})
+
 
 class UDPListener:
-    """Listen for UDP messages from gateways and dispatch them."""
+    """Listen for UDP messages from gateways and dispatch them.
+
+    One socket is opened per local interface used by a config entry; all of
+    them feed the same protocol, which does the decoding, filtering and
+    dispatching. Sockets are reference-counted by config entry. Commands go
+    out through one long-lived send transport per bind IP, also owned here.
+    """
 
-    def __init__(self, hass: HomeAssistant, bind_ip: str | None = None) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        batch_window: float | None = None,
+        source_filter: bool = False,
+        source_learning: bool = False,
+        bulk_receive: bool = False,
+        receive_buffer: int = 0,
+        receive_thread: bool = False,
+        command_window: float = 0,
+        acked_delivery: bool = False,
+        command_interval: float = 0,
+        gateway_rate: float = 0,
+    ) -> None:
         self._hass = hass
-        self._bind_ip = bind_ip or ""
-        self._transport: asyncio.DatagramTransport | None = None
+        self._batch_window = batch_window
+        self._source_filter = source_filter
+        self._source_learning = source_learning
+        self._bulk_receive = bulk_receive and hasattr(socket.socket, "recvmsg")
+        self._receive_buffer = receive_buffer
+        self._receive_thread = receive_thread and hasattr(socket.socket, "recvmsg")
+        self.gateways = GatewayIndex()
+        self._protocol = _UDPProtocol(
+            hass, self.gateways, batch_window, source_filter, source_learning
+        )
+        self._sockets: dict[str, _ListenerSocket] = {}
+        self._entries: dict[str, str] = {}
+        self._senders: dict[str, asyncio.DatagramTransport] = {}
+        self._sender_lock = asyncio.Lock()
+        self._command_cache: dict[tuple[str, str, bool], bytes] = {}
+        self._command_window = command_window
+        self._command_batches: dict[tuple[str, int], _CommandBatch] = {}
+        self.commands_sent = 0
+        self.command_cache_hits = 0
+        self.commands_coalesced = 0
+        self.multi_datagrams = 0
+        self._tracker = (
+            CommandTracker(hass.loop, self._resend) if acked_delivery else None
+        )
+        self._protocol.tracker = self._tracker
+        self._collapser = (
+            CommandCollapser(hass.loop, command_interval, self._transmit)
+            if command_interval
+            else None
+        )
+        self._scheduler = (
+            SendScheduler(hass.loop, gateway_rate, self._sendto) if gateway_rate else None
+        )
 
-    async def async_start(self) -> None:
-        if self._transport is not None:
+    async def async_add_entry(
+        self, entry_id: str, bind_ip: str, interface: str | None = None
+    ) -> None:
+        """Make sure a socket listens on the interface used by this entry."""
+
+        previous = self._entries.get(entry_id)
+        self._entries[entry_id] = bind_ip
+        if previous is not None and previous != bind_ip:
+            await self._async_release(previous)
+        if bind_ip in self._sockets:
             return
 
-        loop = asyncio.get_running_loop()
-        def _bind_socket() -> socket.socket:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            if hasattr(socket, "SO_REUSEPORT"):
-                try:
-                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-                except OSError:
-                    pass
-            bind_host = self._bind_ip or "0.0.0.0"
-            sock.bind((bind_host, GATEWAY_RESPONSE_PORT))
-            return sock
-
-        self._transport, _ = await loop.create_datagram_endpoint(
-            lambda: _UDPProtocol(self._hass),
-            sock=_bind_socket(),
+        listener_socket = _ListenerSocket(bind_ip, interface)
+        await listener_socket.async_open(
+            self._protocol, self._bulk_receive, self._receive_thread, self._receive_buffer
         )
+        self._sockets[bind_ip] = listener_socket
+
+    def registrations(self) -> list[tuple[str, str, str | None]]:
+        """(entry_id, bind_ip, interface) of every entry, to re-add them to a new listener."""
+        registrations = []
+        for entry_id, bind_ip in self._entries.items():
+            listener_socket = self._sockets.get(bind_ip)
+            registrations.append(
+                (entry_id, bind_ip, listener_socket.interface if listener_socket else None)
+            )
+        return registrations
+
+    async def async_remove_entry(self, entry_id: str) -> bool:
+        """Release the entry's socket; return True once no entry uses the listener."""
+
+        bind_ip = self._entries.pop(entry_id, None)
+        if bind_ip is not None:
+            await self._async_release(bind_ip)
+        return not self._entries
+
+    async def _async_release(self, bind_ip: str) -> None:
+        if bind_ip in self._entries.values():
+            return
+        if listener_socket := self._sockets.pop(bind_ip, None):
+            await listener_socket.async_close()
+        if sender := self._senders.pop(bind_ip, None):
+            sender.close()
+
+    async def async_send(
+        self,
+        host: str,
+        payload: dict[str, Any],
+        port: int,
+        binary: bool,
+        coalesce: bool = False,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> None:
+        """Send a command from the transport of the gateway's bind IP.
+
+        Device commands closer together than the command interval wait, and
+        only the newest one per device endpoint is sent. With ``coalesce``
+        (the gateway accepts multi-command datagrams) device commands are
+        then held for the command window and sent together. Finally the
+        gateway's scheduler paces datagrams by ``priority``.
+        """
+
+        bind_ip = _bind_ip_for_host(self._hass, host)
+        sender = self._senders.get(bind_ip)
+        if sender is None or sender.is_closing():
+            await self._async_sender(bind_ip)
+        target = _SendTarget(bind_ip, host, port, binary, coalesce, priority)
+        if self._collapser is not None and payload.get("type") == "device_cmd":
+            endpoint, sep, _ = str(payload.get("com", "")).partition("_")
+            slot = (host, str(payload.get("dest")).upper(), endpoint if sep else "")
+            if not self._collapser.submit(slot, target, payload):
+                return
+        self._transmit(target, payload)
+
+    def _transmit(self, target: _SendTarget, payload: dict[str, Any]) -> None:
+        tracked = self._tracker is not None and payload.get("type") in TRACKED_COMMANDS
+        if tracked and "req_id" not in payload:
+            payload = {**payload, "req_id": self._tracker.next_id()}
+        if (
+            target.coalesce
+            and self._command_window
+            and payload.get("type") == "device_cmd"
+        ):
+            self._queue_command(target, payload)
+            return
+        data = self._encode(payload, target.binary)
+        addr = (target.host, target.port)
+        req_id = self._tracker.track(payload, data, target.bind_ip, addr) if tracked else None
+        on_sent = partial(self._tracker.sent, req_id) if req_id is not None else None
+        if not self._submit(target.bind_ip, addr, data, 1, target.priority, on_sent):
+            if req_id is not None:
+                self._tracker.discard(req_id)
+        self.commands_sent += 1
+
+    def _submit(
+        self,
+        bind_ip: str,
+        addr: tuple[str, int],
+        data: bytes,
+        cost: int,
+        priority: int,
+        on_sent: Callable[[], None] | None = None,
+    ) -> bool:
+        if self._scheduler is not None:
+            return self._scheduler.submit(bind_ip, addr, data, cost, priority, on_sent)
+        if not self._sendto(bind_ip, data, addr):
+            return False
+        if on_sent is not None:
+            on_sent()
+        return True
+
+    def _resend(
+        self, bind_ip: str, data: bytes, addr: tuple[str, int], on_sent: Callable[[], None]
+    ) -> bool:
+        if bind_ip not in self._senders:
+            return False
+        return self._submit(bind_ip, addr, data, 1, PRIORITY_RETRY, on_sent)
+
+    def _sendto(self, bind_ip: str, data: bytes, addr: tuple[str, int]) -> bool:
+        sender = self._senders.get(bind_ip)
+        if sender is None or sender.is_closing():
+            _LOGGER.debug("Dropping datagram for %s; listener closed", addr[0])
+            return False
+        sender.sendto(data, addr)
+        return True
+
+    def _queue_command(self, target: _SendTarget, payload: dict[str, Any]) -> None:
+        key = (target.host, target.port)
+        batch = self._command_batches.get(key)
+        if batch is None:
+            batch = self._command_batches[key] = _CommandBatch(target)
+            batch.handle = self._hass.loop.call_later(
+                self._command_window, self._flush_commands, key
+            )
+        batch.payloads.append(payload)
+        batch.priority = min(batch.priority, target.priority)
+        if len(batch.payloads) >= COMMAND_BATCH_MAX:
+            self._flush_commands(key)
+
+    def _flush_commands(self, key: tuple[str, int]) -> None:
+        batch = self._command_batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.handle is not None:
+            batch.handle.cancel()
+        target = batch.target
+        addr = (target.host, target.port)
+        if len(batch.payloads) == 1:
+            data = self._encode(batch.payloads[0], target.binary)
+        else:
+            data = json.dumps(
+                {
+                    "type": "device_cmd_multi",
+                    "cmds": [
+                        {key: payload[key] for key in ("dest", "com", "req_id") if key in payload}
+                        for payload in batch.payloads
+                    ],
+                }
+            ).encode()
+            self.multi_datagrams += 1
+            self.commands_coalesced += len(batch.payloads)
+        req_ids = []
+        if self._tracker is not None:
+            # Retransmissions of coalesced commands go out one by one.
+            for payload in batch.payloads:
+                if "req_id" not in payload:
+                    continue
+                if len(batch.payloads) > 1:
+                    single = self._encode(payload, target.binary)
+                else:
+                    single = data
+                req_id = self._tracker.track(payload, single, target.bind_ip, addr)
+                if req_id is not None:
+                    req_ids.append(req_id)
+        on_sent = partial(self._commands_sent, req_ids) if req_ids else None
+        if not self._submit(
+            target.bind_ip, addr, data, len(batch.payloads), batch.priority, on_sent
+        ):
+            for req_id in req_ids:
+                self._tracker.discard(req_id)
+        self.commands_sent += len(batch.payloads)
+
+    def _commands_sent(self, req_ids: list[str]) -> None:
+        for req_id in req_ids:
+            self._tracker.sent(req_id)
+
+    async def _async_sender(self, bind_ip: str) -> asyncio.DatagramTransport:
+        async with self._sender_lock:
+            sender = self._senders.get(bind_ip)
+            if sender is None or sender.is_closing():
+                sender, _ = await self._hass.loop.create_datagram_endpoint(
+                    _SendProtocol,
+                    local_addr=(bind_ip, 0) if bind_ip else None,
+                    family=socket.AF_INET,
+                )
+                self._senders[bind_ip] = sender
+            return sender
+
+    def _encode(self, payload: dict[str, Any], binary: bool) -> bytes:
+        # Plain device commands are re-sent with the same few (dest, com)
+        # pairs over and over: keep their bytes instead of re-serializing,
+        # and only splice in the request id when there is one.
+        req_id = payload.get("req_id")
+        if payload.get("type") != "device_cmd" or len(payload) != (3 if req_id is None else 4):
+            return _encode_payload(payload, binary)
+        key = (str(payload.get("dest")), str(payload.get("com")), binary)
+        data = self._command_cache.get(key)
+        if data is not None:
+            self.command_cache_hits += 1
+        else:
+            data = _encode_payload(
+                {"type": "device_cmd", "dest": payload.get("dest"), "com": payload.get("com")},
+                binary,
+            )
+            if len(self._command_cache) >= COMMAND_CACHE_SIZE:
+                del self._command_cache[next(iter(self._command_cache))]
+            self._command_cache[key] = data
+        if req_id is None:
+            return data
+        if is_frame(data):
+            if not isinstance(req_id, int):
+                return _encode_payload(payload, binary)
+            return data[:4] + (req_id & 0xFFFF).to_bytes(2, "big") + data[6:]
+        return b"%s, \"req_id\": %s}" % (data[:-1], json.dumps(req_id).encode())
+
+    def refresh_gateways(self) -> None:
+        """Re-index known gateways after config entries were added or removed."""
+        self.gateways.rebuild(self._hass.data.get(DOMAIN, {}))
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "sockets": {
+                bind_ip or "0.0.0.0": listener_socket.as_dict()
+                for bind_ip, listener_socket in self._sockets.items()
+            },
+            "batch_window": self._batch_window,
+            "source_filter": self._source_filter,
+            "source_learning": self._source_learning,
+            "gateways": self.gateways.as_dict(),
+            "duplicates": self._protocol.duplicates.as_dict(),
+            "rate_limit": self._protocol.rate_limiter.as_dict(),
+            "send": {
+                "transports": sorted(ip or "0.0.0.0" for ip in self._senders),
+                "commands": self.commands_sent,
+                "cache_hits": self.command_cache_hits,
+                "cached": len(self._command_cache),
+                "command_window": self._command_window,
+                "coalesced": self.commands_coalesced,
+                "multi_datagrams": self.multi_datagrams,
+            },
+            "delivery": self._tracker.as_dict() if self._tracker else None,
+            "collapse": self._collapser.as_dict() if self._collapser else None,
+            "pacing": self._scheduler.as_dict() if self._scheduler else None,
+        }
+
+    def socket_diagnostics(self) -> dict[str, Any]:
+        """Kernel-side view of the receive sockets; reads /proc, run in the executor."""
+        return {
+            bind_ip or "0.0.0.0": listener_socket.kernel_counters()
+            for bind_ip, listener_socket in list(self._sockets.items())
+        }
+
+    async def async_stop(self) -> None:
+        sockets = list(self._sockets.values())
+        self._sockets.clear()
+        for listener_socket in sockets:
+            await listener_socket.async_close()
+        for batch in self._command_batches.values():
+            if batch.handle is not None:
+                batch.handle.cancel()
+        self._command_batches.clear()
+        if self._tracker is not None:
+            self._tracker.cancel()
+        if self._collapser is not None:
+            self._collapser.cancel()
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        for sender in self._senders.values():
+            sender.close()
+        self._senders.clear()
+        self._entries.clear()
+        self._protocol.cancel_pending()
+        _LOGGER.debug("UDP listener stopped")
+
+
+class _ListenerSocket:
+    """One bound receive socket, served by asyncio, a _BulkReceiver or a _ThreadedReceiver."""
+
+    def __init__(self, bind_ip: str, interface: str | None) -> None:
+        self.bind_ip = bind_ip
+        self.interface = interface
+        self._sock: socket.socket | None = None
+        self._transport: (
+            asyncio.DatagramTransport | _BulkReceiver | _ThreadedReceiver | None
+        ) = None
+
+    def _bind(self, receive_buffer: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        if receive_buffer:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        bind_host = self.bind_ip or "0.0.0.0"
+        if self.interface and hasattr(socket, "SO_BINDTODEVICE"):
+            # A socket bound to a unicast address never sees broadcasts;
+            # binding the wildcard to the device receives both on that NIC.
+            try:
+                sock.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_BINDTODEVICE, self.interface.encode()
+                )
+                bind_host = "0.0.0.0"
+            except OSError as err:
+                _LOGGER.debug(
+                    "Cannot bind UDP socket to %s (%s); binding %s instead",
+                    self.interface,
+                    err,
+                    bind_host,
+                )
+        sock.bind((bind_host, GATEWAY_RESPONSE_PORT))
+        return sock
+
+    async def async_open(
+        self,
+        protocol: _UDPProtocol,
+        bulk_receive: bool,
+        receive_thread: bool,
+        receive_buffer: int,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        self._sock = self._bind(receive_buffer)
+        if receive_thread:
+            receiver = _ThreadedReceiver(loop, self._sock, protocol, self.bind_ip)
+            receiver.start()
+            self._transport = receiver
+        elif bulk_receive:
+            receiver = _BulkReceiver(loop, self._sock, protocol)
+            receiver.start()
+            self._transport = receiver
+        else:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: protocol, sock=self._sock
+            )
         _LOGGER.debug(
-            "UDP listener started on %s:%s",
-            self._bind_ip or "0.0.0.0",
+            "UDP listener started on %s:%s (interface=%s, thread=%s, bulk=%s, rcvbuf=%s)",
+            self.bind_ip or "0.0.0.0",
             GATEWAY_RESPONSE_PORT,
+            self.interface,
+            receive_thread,
+            bulk_receive,
+            self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
         )
 
-    async def async_stop(self) -> None:
-        if self._transport is None:
+    async def async_close(self) -> None:
+        transport, self._transport = self._transport, None
+        if isinstance(transport, _ThreadedReceiver):
+            await transport.async_stop()
+        elif transport is not None:
+            transport.close()
+        self._sock = None
+        _LOGGER.debug("UDP listener on %s stopped", self.bind_ip or "0.0.0.0")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "interface": self.interface,
+            "bulk_receive": self._transport.as_dict()
+            if isinstance(self._transport, _BulkReceiver)
+            else None,
+            "receive_thread": self._transport.as_dict()
+            if isinstance(self._transport, _ThreadedReceiver)
+            else None,
+        }
+
+    def kernel_counters(self) -> dict[str, Any]:
+        sock = self._sock
+        if sock is None or sock.fileno() == -1:
+            return {}
+        result: dict[str, Any] = {
+            "receive_buffer": sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+        }
+        result.update(_proc_udp_counters(os.fstat(sock.fileno()).st_ino))
+        return result
+
+
+class _BulkReceiver:
+    """Drain several datagrams per readiness event straight from the socket.
+
+    The default asyncio transport reads one datagram per event loop
+    iteration, which lets the kernel queue overflow during report storms.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, sock: socket.socket, protocol: _UDPProtocol
+    ) -> None:
+        self._loop = loop
+        self._sock = sock
+        self._protocol = protocol
+        self._ancbufsize = 0
+        self.wakeups = 0
+        self.datagrams = 0
+        self.max_drained = 0
+        self.kernel_drops = 0
+
+    def start(self) -> None:
+        self._ancbufsize = _prepare_nonblocking(self._sock)
+        self._loop.add_reader(self._sock.fileno(), self._read_ready)
+
+    def _read_ready(self) -> None:
+        self.wakeups += 1
+        datagrams, kernel_drops = _drain_socket(self._sock, self._ancbufsize)
+        if kernel_drops is not None:
+            self.kernel_drops = kernel_drops
+        for data, addr in datagrams:
+            self._protocol.datagram_received(data, addr)
+        self.datagrams += len(datagrams)
+        self.max_drained = max(self.max_drained, len(datagrams))
+
+    def close(self) -> None:
+        if self._sock.fileno() != -1:
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "wakeups": self.wakeups,
+            "datagrams": self.datagrams,
+            "max_drained": self.max_drained,
+            "kernel_drops": self.kernel_drops,
+        }
+
+
+class _ThreadedReceiver:
+    """Receive and parse datagrams on a dedicated thread.
+
+    The thread owns the socket, decodes and validates every datagram and
+    queues the resulting messages; the event loop is woken with
+    call_soon_threadsafe once per batch and only runs filtering and
+    dispatching. The queue is bounded: when the loop falls behind, new
+    messages are dropped and counted as overflow.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sock: socket.socket,
+        protocol: _UDPProtocol,
+        name: str,
+    ) -> None:
+        self._loop = loop
+        self._sock = sock
+        self._protocol = protocol
+        self._ancbufsize = 0
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"bhk_udp_receive {name or '0.0.0.0'}", daemon=True
+        )
+        self._lock = threading.Lock()
+        self._queue: list[tuple[GatewayMessage, Any]] = []
+        self._scheduled = False
+        self.datagrams = 0
+        self.invalid = 0
+        self.handoffs = 0
+        self.max_batch = 0
+        self.queue_high_water = 0
+        self.overflow = 0
+        self.kernel_drops = 0
+
+    def start(self) -> None:
+        self._ancbufsize = _prepare_nonblocking(self._sock)
+        self._thread.start()
+
+    def _run(self) -> None:
+        sock = self._sock
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(sock, selectors.EVENT_READ)
+                selector.register(self._wake_r, selectors.EVENT_READ)
+                self._receive(selector)
+        except Exception:
+            _LOGGER.exception("UDP receive thread %s failed", self._thread.name)
+        else:
+            if not self._stopping.is_set():
+                _LOGGER.error("UDP receive thread %s stopped unexpectedly", self._thread.name)
+        finally:
+            sock.close()
+
+    def _receive(self, selector: selectors.BaseSelector) -> None:
+        sock = self._sock
+        while not self._stopping.is_set():
+            events = selector.select()
+            if self._stopping.is_set() or any(
+                key.fileobj is self._wake_r for key, _ in events
+            ):
+                return
+            datagrams, kernel_drops = _drain_socket(sock, self._ancbufsize)
+            if kernel_drops is not None:
+                self.kernel_drops = kernel_drops
+            self.datagrams += len(datagrams)
+            parsed = []
+            for data, addr in datagrams:
+                try:
+                    message = _parse_datagram(data, addr)
+                except Exception:
+                    _LOGGER.exception("Failed to parse UDP datagram from %s: %r", addr, data)
+                    message = None
+                if message is None:
+                    self.invalid += 1
+                else:
+                    parsed.append((message, addr))
+            if parsed:
+                self._enqueue(parsed)
+
+    def _enqueue(self, parsed: list[tuple[GatewayMessage, Any]]) -> None:
+        with self._lock:
+            room = RECEIVE_THREAD_QUEUE_SIZE - len(self._queue)
+            if room < len(parsed):
+                self.overflow += len(parsed) - max(room, 0)
+                parsed = parsed[: max(room, 0)]
+            self._queue.extend(parsed)
+            self.queue_high_water = max(self.queue_high_water, len(self._queue))
+            schedule = bool(self._queue) and not self._scheduled
+            self._scheduled = self._scheduled or schedule
+        if schedule:
+            try:
+                self._loop.call_soon_threadsafe(self._deliver)
+            except RuntimeError:
+                # The event loop is closing; nothing will consume the queue.
+                self._stopping.set()
+
+    def _deliver(self) -> None:
+        with self._lock:
+            batch, self._queue = self._queue, []
+            self._scheduled = False
+        if self._stopping.is_set():
             return
+        self.handoffs += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        for message, addr in batch:
+            self._protocol.message_received(message, addr)
 
-        self._transport.close()
-        self._transport = None
-        _LOGGER.debug("UDP listener stopped")
+    async def async_stop(self) -> None:
+        self._stopping.set()
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        if self._thread.is_alive():
+            await self._loop.run_in_executor(None, self._thread.join)
+        self._wake_r.close()
+        self._wake_w.close()
+        with self._lock:
+            self._queue.clear()
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            queued = len(self._queue)
+        return {
+            "datagrams": self.datagrams,
+            "invalid": self.invalid,
+            "handoffs": self.handoffs,
+            "max_batch": self.max_batch,
+            "queued": queued,
+            "queue_high_water": self.queue_high_water,
+            "overflow": self.overflow,
+            "kernel_drops": self.kernel_drops,
+        }
+
+
+def _prepare_nonblocking(sock: socket.socket) -> int:
+    """Make ``sock`` non-blocking and return the ancillary buffer size for drops."""
+    sock.setblocking(False)
+    if SO_RXQ_OVFL is None:
+        return 0
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+    except OSError:
+        _LOGGER.debug("SO_RXQ_OVFL not supported; kernel drops read from /proc only")
+        return 0
+    return socket.CMSG_SPACE(4)
+
+
+def _drain_socket(
+    sock: socket.socket, ancbufsize: int
+) -> tuple[list[tuple[bytes, Any]], int | None]:
+    """Read up to BULK_RECEIVE_MAX_DATAGRAMS queued datagrams without blocking.
+
+    Also returns the kernel's cumulative drop counter when it was reported.
+    """
+    datagrams: list[tuple[bytes, Any]] = []
+    kernel_drops = None
+    while len(datagrams) < BULK_RECEIVE_MAX_DATAGRAMS:
+        try:
+            data, ancdata, _flags, addr = sock.recvmsg(RECEIVE_DATAGRAM_SIZE, ancbufsize)
+        except (BlockingIOError, InterruptedError):
+            break
+        except OSError as err:
+            _LOGGER.debug("UDP receive failed: %s", err)
+            break
+        for level, kind, value in ancdata:
+            if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(value) >= 4:
+                kernel_drops = struct.unpack("=I", value[:4])[0]
+        datagrams.append((data, addr))
+    return datagrams, kernel_drops
+
+
+def _parse_datagram(data: bytes, addr) -> GatewayMessage | None:
+    """Decode a datagram into its typed message; safe to call from any thread."""
+    debug = _LOGGER.isEnabledFor(logging.DEBUG)
+    if debug:
+        _LOGGER.debug("UDP datagram from %s len=%d raw=%r", addr, len(data), data)
+
+    payload = decode_datagram(data)
+    if payload is None:
+        if debug:
+            _LOGGER.debug("Discarding non-JSON UDP payload from %s", addr)
+        return None
+
+    message = build_message(payload)
+    if message is None and debug:
+        _LOGGER.debug("Ignoring unsupported UDP message type '%s'", payload.get("type"))
+    return message
+
+
+def _proc_udp_counters(inode: int) -> dict[str, int]:
+    """Return the receive queue and drop counters of a socket from /proc/net/udp."""
+    try:
+        with open("/proc/net/udp", encoding="ascii") as proc:
+            lines = proc.readlines()[1:]
+    except OSError:
+        return {}
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 13 and fields[9] == str(inode):
+            return {
+                "rx_queue": int(fields[4].split(":")[1], 16),
+                "kernel_drops": int(fields[12]),
+            }
+    return {}
 
 
 class _UDPProtocol(asyncio.DatagramProtocol):
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        gateways: GatewayIndex,
+        batch_window: float | None = None,
+        source_filter: bool = False,
+        source_learning: bool = False,
+    ) -> None:
         self._hass = hass
+        self._gateways = gateways
+        self._batch_window = batch_window
+        self._source_filter = source_filter
+        self._source_learning = source_learning
+        self._batch: list[GatewayMessage] = []
+        self._flush_handle: asyncio.Handle | asyncio.TimerHandle | None = None
+        self.duplicates = DuplicateFilter()
+        self.tracker: CommandTracker | None = None
+        self.rate_limiter = ReportRateLimiter(hass.loop, self._dispatch)
 
     def datagram_received(self, data: bytes, addr) -> None:
-        raw_preview = data.decode(errors="replace")
-        _LOGGER.debug("UDP datagram from %s len=%d raw=%r", addr, len(data), raw_preview)
-        try:
-            payload = json.loads(data.decode())
-        except json.JSONDecodeError:
-            _LOGGER.debug("Discarding non-JSON UDP payload from %s", addr)
+        if (
+            self._source_filter
+            and not self._source_learning
+            and addr[0] not in self._gateways.ips
+        ):
+            self._gateways.unknown_dropped += 1
+            return
+
+        message = _parse_datagram(data, addr)
+        if message is not None:
+            self.message_received(message, addr)
+
+    def message_received(self, message: GatewayMessage, addr) -> None:
+        """Filter and dispatch an already parsed message; runs on the event loop."""
+
+        if (
+            self._source_filter
+            and addr[0] not in self._gateways.ips
+            and not (self._source_learning and self._learn_source(message, addr[0]))
+        ):
+            self._gateways.unknown_dropped += 1
+            return
+
+        tracker = self.tracker
+        if isinstance(message, CommandAckMessage):
+            if tracker is not None:
+                tracker.acknowledge(message.req_id)
             return
-        _LOGGER.debug("UDP JSON payload from %s: %s", addr, payload)
-
-        msg_type = str(payload.get("type", "")).lower()
-        if msg_type == "light_register":
-            async_dispatcher_send(self._hass, SIGNAL_LIGHT_REGISTER, payload)
-        elif msg_type == "light_state":
-            async_dispatcher_send(self._hass, SIGNAL_LIGHT_STATE, payload)
-        elif msg_type == "cover_register":
-            async_dispatcher_send(self._hass, SIGNAL_COVER_REGISTER, payload)
-        elif msg_type == "cover_state":
-            async_dispatcher_send(self._hass, SIGNAL_COVER_STATE, payload)
-        elif msg_type == "device_join":
-            async_dispatcher_send(self._hass, SIGNAL_DEVICE_JOIN, payload)
-        elif msg_type == "device_report":
-            async_dispatcher_send(self._hass, SIGNAL_DEVICE_REPORT, payload)
-        elif msg_type == "zigbee_report":
-            async_dispatcher_send(self._hass, SIGNAL_ZB_REPORT, payload)
-        elif msg_type == "gateway_alive":
-            async_dispatcher_send(self._hass, SIGNAL_GATEWAY_ALIVE, payload)
-        elif msg_type == "join_window":
-            async_dispatcher_send(self._hass, SIGNAL_JOIN_WINDOW, payload)
+        if tracker is not None:
+            if isinstance(message, DeviceReportMessage):
+                tracker.confirm_report(message.device_id, message.payload)
+            elif isinstance(message, JoinWindowMessage):
+                tracker.confirm_join(message.gateway_mac, message.data.get("req_id"))
+
+        if isinstance(
+            message, (DeviceReportMessage, DeviceJoinMessage)
+        ) and self._is_duplicate(message, addr):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Dropping duplicate %s from %s", message.type, addr)
+            return
+
+        if isinstance(
+            message, (DeviceReportMessage, LightStateMessage, CoverStateMessage)
+        ) and not self._admit(message, addr):
+            return
+
+        self._dispatch(message)
+
+    def _dispatch(self, message: GatewayMessage) -> None:
+        if self._batch_window is None or message.signal not in BATCHED_SIGNALS:
+            async_dispatcher_send(self._hass, message.signal, message)
+            return
+
+        self._batch.append(message)
+        if self._flush_handle is None:
+            loop = self._hass.loop
+            if self._batch_window:
+                self._flush_handle = loop.call_later(self._batch_window, self._flush_batch)
+            else:
+                self._flush_handle = loop.call_soon(self._flush_batch)
+
+    def _learn_source(self, message: GatewayMessage, ip: str) -> bool:
+        # A configured gateway whose IP changed (e.g. new DHCP lease) is
+        # recognized by the MAC it reports; its entry is updated and reloaded.
+        entry_id = self._gateways.entry_for_mac(message.gateway_mac)
+        entry = self._hass.config_entries.async_get_entry(entry_id) if entry_id else None
+        if entry is None:
+            return False
+
+        self._gateways.ips.add(ip)
+        self._gateways.learned += 1
+        _LOGGER.info(
+            "Gateway %s now sends from %s (was %s); updating its configuration",
+            message.gateway_mac,
+            ip,
+            entry.data.get(CONF_GATEWAY_IP),
+        )
+        self._hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_GATEWAY_IP: ip}
+        )
+        self._hass.async_create_task(self._hass.config_entries.async_reload(entry.entry_id))
+        return True
+
+    def _is_duplicate(
+        self, message: DeviceReportMessage | DeviceJoinMessage, addr
+    ) -> bool:
+        # Several gateways on the LAN may relay the same report or announce.
+        seq = message.data.get("seq")
+        if not isinstance(seq, int) or not seq:
+            seq = None
+        if isinstance(message, DeviceReportMessage):
+            detail = message.payload
+        else:
+            detail = message.device_type
+        return self.duplicates.is_duplicate(
+            message.type,
+            str(message.device_id),
+            detail,
+            seq,
+            addr[0] if addr else None,
+        )
+
+    def _admit(
+        self,
+        message: DeviceReportMessage | LightStateMessage | CoverStateMessage,
+        addr,
+    ) -> bool:
+        # Keeps a flooding device or gateway from saturating the event loop;
+        # over the limit only the latest value per device endpoint is kept.
+        if isinstance(message, DeviceReportMessage):
+            device = message.device_id
+            endpoint, sep, _ = (message.payload or "").partition("_")
+            slot = (device, endpoint if sep else "")
         else:
-            _LOGGER.debug("Ignoring unsupported UDP message type '%s'", msg_type)
+            device = message.unique_id
+            slot = (device, "")
+        if not device:
+            return True
+        gateway = normalize_mac(message.gateway_mac) if message.gateway_mac else addr[0]
+        return self.rate_limiter.submit(message, gateway, device, slot)
+
+    def _flush_batch(self) -> None:
+        self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            async_dispatcher_send(self._hass, SIGNAL_MESSAGE_BATCH, batch)
+
+    def cancel_pending(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._batch.clear()
+        self.rate_limiter.cancel()
+
+
+@dataclass(slots=True, frozen=True)
+class _SendTarget:
+    bind_ip: str
+    host: str
+    port: int
+    binary: bool
+    coalesce: bool
+    priority: int
+
+
+class _CommandBatch:
+    __slots__ = ("target", "priority", "payloads", "handle")
+
+    def __init__(self, target: _SendTarget) -> None:
+        self.target = target
+        self.priority = target.priority
+        self.payloads: list[dict[str, Any]] = []
+        self.handle: asyncio.TimerHandle | None = None
+
+
+class _SendProtocol(asyncio.DatagramProtocol):
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug("UDP send failed: %s", exc)
+
+
+def _encode_payload(payload: dict[str, Any], binary: bool) -> bytes:
+    return (encode_command(payload) if binary else None) or json.dumps(payload).encode()
 
 
 async def async_send_udp_command(
-    hass: HomeAssistant, host: str, payload: dict[str, Any], port: int | None = None
+    hass: HomeAssistant,
+    host: str,
+    payload: dict[str, Any],
+    port: int | None = None,
+    binary: bool = False,
+    coalesce: bool = False,
+    priority: int = PRIORITY_INTERACTIVE,
 ) -> None:
-    """Send a JSON payload to the given host via UDP."""
+    """Send a payload to the given host via UDP.
+
+    With ``binary`` set (the gateway negotiated the binary codec) device
+    commands are sent as binary frames; everything else stays JSON. With
+    ``coalesce`` set (the gateway accepts multi-command datagrams) device
+    commands sent within the command window share one datagram. ``priority``
+    orders the command in the gateway's send queue when it is over budget.
+    """
 
     target_port = port or GATEWAY_COMMAND_PORT
-    data = json.dumps(payload).encode()
     _LOGGER.debug("UDP send to %s:%s payload=%s", host, target_port, payload)
 
-    bind_ip = ""
-    if DOMAIN in hass.data:
-        bind_ip = hass.data[DOMAIN].get(CONF_LOCAL_BIND_IP, "")
+    listener: UDPListener | None = hass.data.get(DOMAIN, {}).get("udp_listener")
+    if listener is not None:
+        await listener.async_send(host, payload, target_port, binary, coalesce, priority)
+        return
+
+    data = _encode_payload(payload, binary)
+    bind_ip = _bind_ip_for_host(hass, host)
 
     def _send() -> None:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
@@ -130,3 +1003,11 @@ async def async_send_udp_command(
 
     loop = asyncio.get_running_loop()
     await loop.run_in_executor(None, _send)
+
+
+def _bind_ip_for_host(hass: HomeAssistant, host: str) -> str:
+    """Return the local bind IP of the config entry whose gateway is ``host``."""
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        if isinstance(entry_data, dict) and entry_data.get(CONF_GATEWAY_IP) == host:
+            return entry_data.get(CONF_LOCAL_BIND_IP) or ""
+    return ""
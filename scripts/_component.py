@@ -0,0 +1,23 @@
+"""Load modules of the integration without importing Home Assistant.
+
+Only the modules that do not depend on Home Assistant (const, messages, ...)
+can be loaded this way; the package ``__init__`` is bypassed on purpose.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+COMPONENT_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "bhk_integration"
+PACKAGE = "bhk_integration"
+
+
+def load(module: str) -> types.ModuleType:
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
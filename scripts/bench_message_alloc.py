@@ -0,0 +1,117 @@
+"""Count allocations per message: per-consumer key normalization vs the shared message.
+
+Run with ``python scripts/bench_message_alloc.py``. Each decoded datagram is
+handed to the consumers that read it in the integration: LightManager and
+CoverManager for device_join / device_report, the manager and then the
+entity for light_state / cover_state. Everything a consumer allocates is
+kept alive until the round is measured, so the counts are allocations, not
+the net memory left behind.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from _component import load
+
+messages = load("messages")
+
+DATAGRAMS = [
+    {
+        "type": "device_report",
+        "device_id": f"A1B2C3D4E5{idx % 100:02X}",
+        "payload": f"{idx % 3 + 1}_{'ON' if idx % 2 else 'OFF'}",
+        "gateway_mac": "001122334455",
+    }
+    for idx in range(800)
+] + [
+    {"type": "light_state", "unique_id": f"A1B2C3D4E5{idx:02X}_1", "state": "ON"}
+    for idx in range(100)
+] + [
+    {"type": "cover_state", "unique_id": f"VR{idx:04X}", "state": "OPEN", "position": 100}
+    for idx in range(50)
+] + [
+    {
+        "type": "device_join",
+        "device_id": f"A1B2C3D4E5{idx:02X}",
+        "device_type": "3Lights",
+        "gateway_mac": "001122334455",
+    }
+    for idx in range(50)
+]
+
+# How many times the payload is read after decoding, per message type.
+CONSUMERS = {
+    "device_report": 2,
+    "device_join": 2,
+    "light_state": 2,
+    "cover_state": 2,
+}
+
+
+def legacy(payload: dict, keep: list) -> None:
+    # Before: every manager and entity lower-cased the raw keys again.
+    for _ in range(CONSUMERS[payload["type"]]):
+        normalized = {str(k).lower(): v for k, v in payload.items()}
+        keep.append(normalized)
+        keep.append(str(normalized.get("state", "")).lower())
+
+
+def shared(payload: dict, keep: list) -> None:
+    message = messages.build_message(payload)
+    keep.append(message)
+    for _ in range(CONSUMERS[payload["type"]]):
+        getattr(message, "state", None) == "on"
+
+
+def allocations(handler, payloads: list[dict]) -> tuple[float, float]:
+    keep: list = []
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        before = tracemalloc.get_traced_memory()[0]
+        for payload in payloads:
+            handler(payload, keep)
+        after = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks() - blocks
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    return blocks / len(payloads), (after - before) / len(payloads)
+
+
+def throughput(handler, repeat: int = 15) -> float:
+    best = 0.0
+    for _ in range(repeat):
+        keep: list = []
+        start = time.perf_counter()
+        for payload in DATAGRAMS:
+            handler(payload, keep)
+        best = max(best, len(DATAGRAMS) / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    for msg_type in CONSUMERS:
+        payloads = [payload for payload in DATAGRAMS if payload["type"] == msg_type]
+        print(f"{msg_type} ({CONSUMERS[msg_type]} consumers):")
+        for label, handler in (("per-consumer dicts", legacy), ("shared message", shared)):
+            blocks, size = allocations(handler, payloads)
+            print(f"  {label:20}: {blocks:5.2f} allocations, {size:5.0f} bytes per message")
+    print("whole mix:")
+    for label, handler in (("per-consumer dicts", legacy), ("shared message", shared)):
+        blocks, size = allocations(handler, DATAGRAMS)
+        rate = throughput(handler)
+        print(
+            f"  {label:20}: {blocks:5.2f} allocations, {size:5.0f} bytes per message,"
+            f" {rate:,.0f} messages/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
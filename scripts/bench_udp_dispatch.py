@@ -0,0 +1,119 @@
+"""Compare datagrams/second of the legacy if/elif receive path and the dispatch table.
+
+Run with ``python scripts/bench_udp_dispatch.py``. Debug logging is disabled,
+as it is on a production Home Assistant instance.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+
+from _component import load
+
+const = load("const")
+messages = load("messages")
+
+_LOGGER = logging.getLogger("bench")
+_LOGGER.setLevel(logging.INFO)
+
+DATAGRAMS = [
+    json.dumps(
+        {
+            "type": "device_report",
+            "device_id": f"A1B2C3D4E5{idx % 100:02X}",
+            "payload": f"{idx % 3 + 1}_{'ON' if idx % 2 else 'OFF'}",
+            "gateway_mac": "001122334455",
+        }
+    ).encode()
+    for idx in range(1000)
+] + [
+    json.dumps({"type": "gateway_alive", "mac": "001122334455"}).encode(),
+    json.dumps({"type": "cover_state", "unique_id": "VR445566", "state": "OPEN"}).encode(),
+]
+
+
+SUBSCRIBERS = 0
+
+
+def _dispatch(signal: str, payload) -> None:
+    # LightManager and CoverManager both subscribe to device reports; in the
+    # legacy path each of them lower-cases the raw payload keys again.
+    for _ in range(SUBSCRIBERS):
+        if isinstance(payload, dict):
+            {str(k).lower(): v for k, v in payload.items()}
+        else:
+            payload.type, payload.gateway_mac
+
+
+def legacy_datagram_received(data: bytes, addr) -> None:
+    raw_preview = data.decode(errors="replace")
+    _LOGGER.debug("UDP datagram from %s len=%d raw=%r", addr, len(data), raw_preview)
+    try:
+        payload = json.loads(data.decode())
+    except json.JSONDecodeError:
+        return
+    _LOGGER.debug("UDP JSON payload from %s: %s", addr, payload)
+
+    msg_type = str(payload.get("type", "")).lower()
+    if msg_type == "light_register":
+        _dispatch(const.SIGNAL_LIGHT_REGISTER, payload)
+    elif msg_type == "light_state":
+        _dispatch(const.SIGNAL_LIGHT_STATE, payload)
+    elif msg_type == "cover_register":
+        _dispatch(const.SIGNAL_COVER_REGISTER, payload)
+    elif msg_type == "cover_state":
+        _dispatch(const.SIGNAL_COVER_STATE, payload)
+    elif msg_type == "device_join":
+        _dispatch(const.SIGNAL_DEVICE_JOIN, payload)
+    elif msg_type == "device_report":
+        _dispatch(const.SIGNAL_DEVICE_REPORT, payload)
+    elif msg_type == "zigbee_report":
+        _dispatch(const.SIGNAL_ZB_REPORT, payload)
+    elif msg_type == "gateway_alive":
+        _dispatch(const.SIGNAL_GATEWAY_ALIVE, payload)
+    elif msg_type == "join_window":
+        _dispatch(const.SIGNAL_JOIN_WINDOW, payload)
+
+
+def table_datagram_received(data: bytes, addr) -> None:
+    debug = _LOGGER.isEnabledFor(logging.DEBUG)
+    if debug:
+        _LOGGER.debug("UDP datagram from %s len=%d raw=%r", addr, len(data), data)
+    payload = messages.decode_datagram(data)
+    if payload is None:
+        return
+    message = messages.build_message(payload)
+    if message is None:
+        return
+    _dispatch(message.signal, message)
+
+
+def run(handler, rounds: int = 10, repeat: int = 15) -> float:
+    addr = ("192.168.1.42", 50002)
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for datagram in DATAGRAMS:
+                handler(datagram, addr)
+        elapsed = time.perf_counter() - start
+        best = max(best, rounds * len(DATAGRAMS) / elapsed)
+    return best
+
+
+def main() -> None:
+    global SUBSCRIBERS
+
+    for subscribers in (0, 2):
+        SUBSCRIBERS = subscribers
+        before = run(legacy_datagram_received)
+        after = run(table_datagram_received)
+        print(f"{subscribers} subscriber(s) reading the message:")
+        print(f"  legacy if/elif : {before:,.0f} datagrams/s")
+        print(f"  dispatch table : {after:,.0f} datagrams/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
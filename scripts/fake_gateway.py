@@ -0,0 +1,176 @@
+"""Local gateway stand-in for exercising the integration without hardware.
+
+It answers the ``DISCOVER_GATEWAY`` broadcast, advertising the binary codec
+unless ``--json-only`` is given and multi-command datagrams unless
+``--single-commands`` is given. Every ``device_cmd`` (JSON or binary frame)
+is answered with the matching ``device_report`` in the format the command
+used, and every command of a ``device_cmd_multi`` with a JSON report.
+``open_join`` is answered with a ``join_window`` echoing its ``req_id``,
+light groups are stored from ``group_sync`` and switched by ``group_cmd``, and
+``--loss`` drops that share of incoming commands to exercise retransmission.
+It also sends a ``gateway_alive`` heartbeat every 30 seconds.
+
+    python scripts/fake_gateway.py --ha 192.168.1.10 --mac AA:BB:CC:DD:EE:FF
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+
+from _component import load
+
+codec = load("codec")
+const = load("const")
+
+
+class FakeGateway(asyncio.DatagramProtocol):
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._args = args
+        self._transport: asyncio.DatagramTransport | None = None
+        self._seq = 0
+        self._groups: dict[int, list[dict]] = {}
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+
+    def _send(self, data: bytes, host: str) -> None:
+        assert self._transport is not None
+        self._transport.sendto(data, (host, const.GATEWAY_RESPONSE_PORT))
+
+    def _reply_to(self, addr) -> str:
+        return self._args.ha or addr[0]
+
+    def _features(self) -> list[str]:
+        features = []
+        if not self._args.json_only:
+            features.append(codec.FEATURE_BINARY)
+        if not self._args.single_commands:
+            features.append(const.FEATURE_MULTI_COMMAND)
+        features.append(const.FEATURE_GROUPS)
+        return features
+
+    def _ack(self, command: dict, addr) -> None:
+        ack = {"type": "cmd_ack", "req_id": command.get("req_id"), "gateway_mac": self._args.mac}
+        self._send(json.dumps(ack).encode(), self._reply_to(addr))
+
+    def _report(self, command: dict, binary: bool) -> bytes:
+        self._seq += 1
+        if binary and not self._args.json_only:
+            return codec.encode_frame(
+                "device_report",
+                device_id=command["dest"],
+                payload=command["com"],
+                gateway_mac=self._args.mac,
+                seq=self._seq,
+            )
+        return json.dumps(
+            {
+                "type": "device_report",
+                "device_id": command["dest"],
+                "payload": command["com"],
+                "gateway_mac": self._args.mac,
+            }
+        ).encode()
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if data.strip() == const.DISCOVERY_MESSAGE.encode():
+            response = {
+                "Device": "NETWORK-GATEWAY",
+                "MAC": self._args.mac,
+                "IP": self._args.ip,
+                "Type": "UDP-BRIDGE",
+                "Version": "1.0.1",
+                "Features": self._features(),
+            }
+            self._send(json.dumps(response).encode(), self._reply_to(addr))
+            print(f"discovery from {addr[0]}")
+            return
+
+        binary = codec.is_frame(data)
+        if binary:
+            command = codec.decode_frame(data)
+        else:
+            try:
+                command = json.loads(data)
+            except ValueError:
+                command = None
+        if command and random.random() < self._args.loss:
+            print(f"lost {command.get('type')} from {addr[0]}")
+            return
+        if command and command.get("type") == "open_join":
+            window = {
+                "type": "join_window",
+                "mac": self._args.mac,
+                "duration_s": command.get("duration_s"),
+                "req_id": command.get("req_id"),
+            }
+            self._send(json.dumps(window).encode(), self._reply_to(addr))
+            return
+        if command and command.get("type") == "group_sync":
+            self._groups = {group["group"]: group["members"] for group in command["groups"]}
+            print(f"groups from {addr[0]}: {self._groups}")
+            self._ack(command, addr)
+            return
+        if command and command.get("type") == "group_cmd":
+            members = self._groups.get(command.get("group"), [])
+            print(f"group {command.get('group')} {command.get('com')} ({len(members)} lights)")
+            self._ack(command, addr)
+            for member in members:
+                single = {"dest": member["dest"], "com": f"{member['ep']}_{command['com']}"}
+                self._send(self._report(single, False), self._reply_to(addr))
+            return
+        if command and command.get("type") == "device_cmd_multi":
+            print(f"{len(command['cmds'])} commands from {addr[0]}: {command['cmds']}")
+            for single in command["cmds"]:
+                self._send(self._report(single, False), self._reply_to(addr))
+            return
+        if not command or command.get("type") != "device_cmd":
+            print(f"ignored {data!r} from {addr[0]}")
+            return
+
+        print(f"{'binary' if binary else 'json'} command from {addr[0]}: {command}")
+        self._send(self._report(command, binary), self._reply_to(addr))
+
+    async def heartbeat(self) -> None:
+        while True:
+            if self._args.ha:
+                alive = {"type": "gateway_alive", "mac": self._args.mac}
+                self._send(json.dumps(alive).encode(), self._args.ha)
+            await asyncio.sleep(30)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mac", default="AA:BB:CC:DD:EE:FF")
+    parser.add_argument("--ip", default="127.0.0.1", help="IP advertised in discovery")
+    parser.add_argument("--ha", help="Home Assistant IP (default: reply to the sender)")
+    parser.add_argument("--bind", default="0.0.0.0")
+    parser.add_argument("--json-only", action="store_true", help="do not offer the binary codec")
+    parser.add_argument(
+        "--single-commands", action="store_true", help="do not offer multi-command datagrams"
+    )
+    parser.add_argument(
+        "--loss", type=float, default=0.0, help="share of commands to ignore (0-1)"
+    )
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.bind((args.bind, const.GATEWAY_COMMAND_PORT))
+
+    loop = asyncio.get_running_loop()
+    _, gateway = await loop.create_datagram_endpoint(lambda: FakeGateway(args), sock=sock)
+    print(f"fake gateway {args.mac} listening on {args.bind}:{const.GATEWAY_COMMAND_PORT}")
+    await gateway.heartbeat()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
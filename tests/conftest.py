@@ -0,0 +1,73 @@
+"""Shared fixtures for the unit tests.
+
+The modules under test do not depend on Home Assistant and are loaded the
+way the bench scripts load them (scripts/_component.py), so these tests run
+without it. Timers go through FakeLoop, whose clock only moves on advance().
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Test modules import ``_component.load`` from here.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+
+class _Timer:
+    def __init__(self, when: float, callback: Callable[..., Any], args: tuple) -> None:
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+
+class FakeLoop:
+    """The part of an asyncio loop the integration's timers use."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._timers: list[tuple[float, int, _Timer]] = []
+        self._order = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> _Timer:
+        timer = _Timer(self.now + max(delay, 0), callback, args)
+        heapq.heappush(self._timers, (timer.when, next(self._order), timer))
+        return timer
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> _Timer:
+        return self.call_later(0, callback, *args)
+
+    def pending(self) -> int:
+        return sum(not timer.cancelled() for _, _, timer in self._timers)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward, running every timer that falls due on the way."""
+        target = self.now + seconds
+        while self._timers and self._timers[0][0] <= target:
+            when, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled():
+                continue
+            self.now = max(self.now, when)
+            timer.callback(*timer.args)
+        self.now = target
+
+
+@pytest.fixture
+def loop() -> FakeLoop:
+    return FakeLoop()
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from _component import load
+
+codec = load("codec")
+messages = load("messages")
+
+GATEWAY = "AA:BB:CC:DD:EE:FF"
+
+
+def test_report_round_trip_splits_the_endpoint():
+    frame = codec.encode_frame("device_report", "A1B2C3", "2_ON", GATEWAY, seq=9)
+    assert codec.is_frame(frame)
+    assert frame[12] == 3 and frame[16] == 2  # id length, endpoint byte
+    assert codec.decode_frame(frame) == {
+        "type": "device_report",
+        "seq": 9,
+        "gateway_mac": GATEWAY,
+        "device_id": "A1B2C3",
+        "payload": "2_ON",
+    }
+
+
+@pytest.mark.parametrize("payload", ["P:30", "OPENING", "0_ON", "256_ON", "x_ON"])
+def test_payload_without_a_valid_endpoint_is_kept_whole(payload):
+    frame = codec.encode_frame("device_report", "C0FFEE", payload)
+    decoded = codec.decode_frame(frame)
+    assert decoded["payload"] == payload
+    assert "gateway_mac" not in decoded
+
+
+def test_join_carries_the_device_type():
+    frame = codec.encode_frame("device_join", "C0FFEE", "3Lights", GATEWAY)
+    decoded = codec.decode_frame(frame)
+    assert decoded["device_type"] == "3Lights" and decoded["device_id"] == "C0FFEE"
+
+
+def test_gateway_alive_reports_its_mac_as_mac():
+    decoded = codec.decode_frame(codec.encode_frame("gateway_alive", gateway_mac=GATEWAY))
+    assert decoded == {"type": "gateway_alive", "seq": 0, "mac": GATEWAY}
+
+
+def test_cmd_ack_echoes_the_sequence_as_req_id():
+    decoded = codec.decode_frame(codec.encode_frame("cmd_ack", gateway_mac=GATEWAY, seq=0x1234))
+    assert decoded["req_id"] == 0x1234
+    assert isinstance(messages.build_message(decoded), messages.CommandAckMessage)
+
+
+def test_command_carries_its_req_id_in_the_sequence_field():
+    frame = codec.encode_command(
+        {"type": "device_cmd", "dest": "A1B2C3", "com": "1_OFF", "req_id": 70000}
+    )
+    assert codec.decode_frame(frame) == {
+        "type": "device_cmd",
+        "seq": 70000 & 0xFFFF,
+        "dest": "A1B2C3",
+        "com": "1_OFF",
+    }
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"type": "open_join", "target_mac": GATEWAY},
+        {"type": "device_cmd", "com": "1_ON"},
+        {"type": "device_cmd", "dest": "not hex", "com": "1_ON"},
+    ],
+)
+def test_commands_that_cannot_be_framed_stay_json(payload):
+    assert codec.encode_command(payload) is None
+
+
+def test_encode_rejects_what_a_frame_cannot_hold():
+    with pytest.raises(ValueError):
+        codec.encode_frame("light_state", "A1")
+    with pytest.raises(ValueError):
+        codec.encode_frame("device_report", "A1", "1_" + "x" * 256)
+    with pytest.raises(ValueError):
+        codec.encode_frame("device_report", "A1", "1_ON", gateway_mac="AA:BB")
+
+
+def test_truncated_or_foreign_frames_decode_to_none():
+    frame = codec.encode_frame("device_report", "A1B2C3", "2_ON", GATEWAY)
+    for cut in range(len(frame)):
+        assert codec.decode_frame(frame[:cut]) is None
+    assert codec.decode_frame(frame[:2] + b"\x02" + frame[3:]) is None  # version
+    assert codec.decode_frame(frame[:3] + b"\x7f" + frame[4:]) is None  # type
+    assert codec.decode_frame(frame[:-1] + b"\xff") is None  # invalid UTF-8
+
+
+def test_json_datagrams_are_not_frames():
+    data = json.dumps({"type": "device_report", "device_id": "A1", "payload": "1_ON"}).encode()
+    assert not codec.is_frame(data)
+    assert messages.decode_datagram(data)["payload"] == "1_ON"
+    frame = codec.encode_frame("device_report", "A1", "1_ON")
+    assert messages.decode_datagram(frame)["payload"] == "1_ON"
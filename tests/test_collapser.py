@@ -0,0 +1,76 @@
+import pytest
+from _component import load
+
+ratelimit = load("ratelimit")
+
+INTERVAL = 0.25
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def collapser(loop, sent):
+    return ratelimit.CommandCollapser(
+        loop, INTERVAL, lambda target, payload: sent.append((target, payload)), clock=loop.time
+    )
+
+
+def test_first_command_passes_and_the_next_waits(loop, collapser, sent):
+    assert collapser.submit("A1/1", "gw", {"com": "1_ON"})
+    assert not collapser.submit("A1/1", "gw", {"com": "1_OFF"})
+    loop.advance(INTERVAL - 0.01)
+    assert sent == []
+    loop.advance(0.01)
+    assert sent == [("gw", {"com": "1_OFF"})]
+
+
+def test_only_the_newest_waiting_command_is_sent(loop, collapser, sent):
+    collapser.submit("C0/", "gw", {"com": "P:10"})
+    for position in (20, 30, 40):
+        assert not collapser.submit("C0/", "gw", {"com": f"P:{position}"})
+    loop.advance(INTERVAL)
+    assert sent == [("gw", {"com": "P:40"})]
+    assert collapser.as_dict() == {
+        "interval": INTERVAL,
+        "passed": 1,
+        "deferred": 1,
+        "collapsed": 2,
+        "pending": 0,
+    }
+
+
+def test_interval_runs_from_the_deferred_send(loop, collapser, sent):
+    collapser.submit("A1/1", "gw", {"com": "1_ON"})
+    loop.advance(0.1)
+    collapser.submit("A1/1", "gw", {"com": "1_OFF"})
+    loop.advance(0.15)  # the OFF goes out now
+    assert not collapser.submit("A1/1", "gw", {"com": "1_ON"})
+    loop.advance(INTERVAL)
+    assert [payload["com"] for _, payload in sent] == ["1_OFF", "1_ON"]
+
+
+def test_endpoints_are_independent(collapser):
+    assert collapser.submit("A1/1", "gw", {"com": "1_ON"})
+    assert collapser.submit("A1/2", "gw", {"com": "2_ON"})
+    assert collapser.submit("B2/1", "gw", {"com": "1_ON"})
+
+
+def test_recently_used_slots_are_kept_at_the_cap(monkeypatch, loop, collapser):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_MAX_BUCKETS", 2)
+    collapser.submit("a", "gw", {})
+    collapser.submit("b", "gw", {})
+    loop.advance(INTERVAL)
+    collapser.submit("a", "gw", {})
+    collapser.submit("c", "gw", {})  # evicts b, the least recently sent
+    assert not collapser.submit("a", "gw", {})
+
+
+def test_cancel_drops_waiting_commands(loop, collapser, sent):
+    collapser.submit("A1/1", "gw", {"com": "1_ON"})
+    collapser.submit("A1/1", "gw", {"com": "1_OFF"})
+    collapser.cancel()
+    loop.advance(1)
+    assert sent == [] and collapser.as_dict()["pending"] == 0
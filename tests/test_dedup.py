@@ -0,0 +1,68 @@
+from _component import load
+
+dedup = load("dedup")
+
+REPORT = "device_report"
+
+
+def _filter(loop, **kwargs):
+    return dedup.DuplicateFilter(clock=loop.time, **kwargs)
+
+
+def test_repeat_from_another_gateway_is_dropped(loop):
+    seen = _filter(loop)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-a")
+    assert seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-b")
+    assert seen.as_dict() == {"passed": 1, "dropped": 1, "tracked": 2}
+
+
+def test_repeat_from_the_same_gateway_passes(loop):
+    seen = _filter(loop)
+    for payload in ("1_ON", "1_OFF", "1_ON"):
+        assert not seen.is_duplicate(REPORT, "A1", payload, None, "gw-a")
+
+
+def test_cross_source_repeat_of_an_older_payload_passes(loop):
+    # ON via A, OFF via A, then ON via B: the device really switched back on.
+    seen = _filter(loop)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-a")
+    assert not seen.is_duplicate(REPORT, "A1", "1_OFF", None, "gw-a")
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-b")
+    # ... and A relaying that same ON is a duplicate again.
+    assert seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-a")
+
+
+def test_sequenced_repeat_is_dropped_from_any_source(loop):
+    seen = _filter(loop)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", 7, "gw-a")
+    assert seen.is_duplicate(REPORT, "A1", "1_ON", 7, "gw-a")
+    assert seen.is_duplicate(REPORT, "A1", "1_ON", 7, "gw-b")
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", 8, "gw-b")
+
+
+def test_devices_and_types_are_kept_apart(loop):
+    seen = _filter(loop)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-a")
+    assert not seen.is_duplicate(REPORT, "B2", "1_ON", None, "gw-b")
+    assert not seen.is_duplicate("device_join", "A1", "1_ON", None, "gw-b")
+
+
+def test_entries_expire_after_the_ttl(loop):
+    seen = _filter(loop, ttl=2.0)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", 1, "gw-a")
+    loop.advance(1.9)
+    assert seen.is_duplicate(REPORT, "A1", "1_ON", 1, "gw-b")
+    loop.advance(0.2)
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", 1, "gw-b")
+    assert seen.as_dict()["tracked"] == 2
+
+
+def test_table_is_bounded_and_evicts_the_oldest(loop):
+    seen = _filter(loop, max_entries=4)
+    for device in ("A1", "B2", "C3"):
+        assert not seen.is_duplicate(REPORT, device, "1_ON", None, "gw-a")
+        loop.advance(0.1)
+    assert seen.as_dict()["tracked"] == 4
+    # A1 was evicted first; C3 is still known.
+    assert not seen.is_duplicate(REPORT, "A1", "1_ON", None, "gw-b")
+    assert seen.is_duplicate(REPORT, "C3", "1_ON", None, "gw-b")
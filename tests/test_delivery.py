@@ -0,0 +1,179 @@
+import json
+import types
+from functools import partial
+
+import pytest
+from _component import load
+
+codec = load("codec")
+const = load("const")
+delivery = load("delivery")
+
+GATEWAY = "AA:BB:CC:DD:EE:FF"
+ADDR = ("192.0.2.10", const.GATEWAY_COMMAND_PORT)
+FIRST_RETRY = const.COMMAND_RETRY_INITIAL_SECONDS
+
+
+class Transport:
+    """Send callback of the tracker; ``hold`` keeps datagrams queued."""
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.queued: list = []
+        self.hold = False
+        self.accept = True
+
+    def __call__(self, bind_ip, data, addr, on_sent) -> bool:
+        if not self.accept:
+            return False
+        if self.hold:
+            self.queued.append((data, on_sent))
+        else:
+            self.sent.append(data)
+            on_sent()
+        return True
+
+    def release(self) -> None:
+        for data, on_sent in self.queued:
+            self.sent.append(data)
+            on_sent()
+        self.queued.clear()
+
+
+@pytest.fixture
+def transport():
+    return Transport()
+
+
+@pytest.fixture
+def tracker(loop, transport):
+    # rng 0.5 means no jitter.
+    return delivery.CommandTracker(loop, transport, clock=loop.time, rng=lambda: 0.5)
+
+
+def _command(tracker, transport, com="2_ON", dest="A1B2C3"):
+    """Track a device command and send its first copy, as UDPListener does."""
+    payload = {"type": "device_cmd", "dest": dest, "com": com, "req_id": tracker.next_id()}
+    data = json.dumps(payload).encode()
+    req_id = tracker.track(payload, data, "", ADDR)
+    transport("", data, ADDR, partial(tracker.sent, req_id))
+    return req_id
+
+
+def test_request_ids_fit_the_frame_sequence_field(tracker):
+    tracker._next_id = 0xFFFE
+    assert [tracker.next_id() for _ in range(3)] == [0xFFFF, 1, 2]
+
+
+def test_unacknowledged_command_is_retried_with_backoff(loop, tracker, transport):
+    _command(tracker, transport)
+    # 0.25 s, then doubling, capped by the 5 s deadline.
+    for copies, wait in ((2, 0.25), (3, 0.5), (4, 1.0), (5, 2.0)):
+        loop.advance(wait - 0.001)
+        assert len(transport.sent) == copies - 1
+        loop.advance(0.001)
+        assert len(transport.sent) == copies
+    loop.advance(const.COMMAND_DEADLINE_SECONDS - loop.time())
+    assert tracker.as_dict()["timeouts"] == 1 and tracker.as_dict()["retries"] == 4
+    assert loop.pending() == 0
+
+
+def test_backoff_starts_when_the_datagram_leaves(loop, tracker, transport):
+    transport.hold = True
+    _command(tracker, transport)
+    loop.advance(1.0)  # held back by pacing: nothing to retry yet
+    assert transport.sent == [] and tracker.as_dict()["retries"] == 0
+    transport.release()
+    loop.advance(FIRST_RETRY - 0.01)
+    assert tracker.as_dict()["retries"] == 0
+    loop.advance(0.01)
+    assert tracker.as_dict()["retries"] == 1
+
+
+def test_ack_stops_the_retries(loop, tracker, transport):
+    req_id = _command(tracker, transport)
+    assert tracker.acknowledge(int(req_id))
+    loop.advance(10)
+    assert len(transport.sent) == 1
+    assert loop.pending() == 0
+    assert not tracker.acknowledge(req_id)
+
+
+def test_light_command_is_confirmed_by_the_identical_report(tracker, transport):
+    _command(tracker, transport, "2_ON")
+    assert not tracker.confirm_report("A1B2C3", "2_OFF")
+    assert not tracker.confirm_report("A1B2C3", "1_ON")
+    assert tracker.confirm_report("a1b2c3", "2_on")
+    assert tracker.as_dict()["confirmed_by_report"] == 1
+
+
+def test_cover_command_is_confirmed_by_any_report(tracker, transport):
+    _command(tracker, transport, "P:30", dest="C0FFEE")
+    assert tracker.confirm_report("C0FFEE", "CLOSING")
+
+
+def test_join_is_confirmed_by_the_join_window(tracker):
+    payload = {"type": "open_join", "target_mac": GATEWAY, "req_id": tracker.next_id()}
+    tracker.sent(tracker.track(payload, b"{}", "", ADDR))
+    assert tracker.confirm_join("aa:bb:cc:dd:ee:ff")
+    assert tracker.as_dict()["in_flight"] == 0
+
+
+def test_group_command_is_only_confirmed_by_its_ack(tracker):
+    payload = {"type": "group_cmd", "target_mac": GATEWAY, "group": 1}
+    payload["req_id"] = tracker.next_id()
+    req_id = tracker.track(payload, b"{}", "", ADDR)
+    assert not tracker.confirm_report("A1B2C3", "1_ON")
+    assert not tracker.confirm_join(GATEWAY)
+    assert tracker.acknowledge(req_id)
+
+
+def test_newer_command_supersedes_the_older_one(loop, tracker, transport):
+    _command(tracker, transport, "2_ON")
+    _command(tracker, transport, "2_OFF")
+    loop.advance(FIRST_RETRY)
+    assert [json.loads(data)["com"] for data in transport.sent] == ["2_ON", "2_OFF", "2_OFF"]
+    assert tracker.as_dict()["superseded"] == 1
+
+
+def test_untracked_messages_are_ignored(tracker):
+    assert tracker.track({"type": "discover"}, b"{}", "", ADDR) is None
+
+
+def test_failed_retransmission_forgets_the_command(loop, tracker, transport):
+    _command(tracker, transport)
+    transport.accept = False
+    loop.advance(FIRST_RETRY)
+    assert tracker.as_dict()["in_flight"] == 0 and loop.pending() == 0
+
+
+def test_discard_forgets_a_command_that_was_never_sent(loop, tracker):
+    payload = {"type": "device_cmd", "dest": "A1", "com": "1_ON", "req_id": tracker.next_id()}
+    req_id = tracker.track(payload, b"{}", "", ADDR)
+    tracker.discard(req_id)
+    tracker.sent(req_id)
+    assert tracker.as_dict()["in_flight"] == 0 and loop.pending() == 0
+
+
+def test_in_flight_table_is_bounded(monkeypatch, tracker, transport):
+    monkeypatch.setattr(delivery, "COMMAND_INFLIGHT_MAX", 2)
+    for dest in ("A1", "B2", "C3"):
+        _command(tracker, transport, dest=dest)
+    assert tracker.as_dict()["in_flight"] == 2 and tracker.as_dict()["evicted"] == 1
+
+
+def test_cached_command_bytes_get_the_req_id_spliced_in(loop):
+    pytest.importorskip("homeassistant")
+    udp = load("udp")
+    listener = udp.UDPListener(types.SimpleNamespace(loop=loop))
+    command = {"type": "device_cmd", "dest": "A1B2C3", "com": "1_ON"}
+
+    plain = listener._encode(command, binary=False)
+    tagged = listener._encode({**command, "req_id": 7}, binary=False)
+    assert json.loads(plain) == command
+    assert json.loads(tagged) == {**command, "req_id": 7}
+
+    frame = listener._encode({**command, "req_id": 0x1234}, binary=True)
+    assert codec.decode_frame(frame)["seq"] == 0x1234
+    assert listener._encode(command, binary=True)[4:6] == b"\0\0"
+    assert listener.command_cache_hits == 2
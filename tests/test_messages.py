@@ -0,0 +1,33 @@
+import pytest
+from _component import load
+
+messages = load("messages")
+
+
+def _cover(**fields):
+    return messages.build_message({"type": "cover_register", "device_id": "C0FFEE", **fields})
+
+
+@pytest.mark.parametrize(
+    ("position", "expected"), [(40, 40), (55.7, 55), (-3, 0), (120, 100), (None, None)]
+)
+def test_cover_position_is_clamped(position, expected):
+    assert _cover(position=position).position == expected
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf"), "50", True, [1]])
+def test_invalid_cover_numbers_are_ignored(value):
+    message = _cover(position=value, open_time=value, close_time=value)
+    assert message.position is None
+    assert message.open_time is None and message.close_time is None
+
+
+def test_nan_from_the_wire_does_not_break_decoding():
+    data = b'{"type": "cover_state", "unique_id": "C0FFEE", "position": NaN, "state": "open"}'
+    message = messages.build_message(messages.decode_datagram(data))
+    assert message.position is None and message.state == "open"
+
+
+def test_travel_times_must_be_positive():
+    message = _cover(open_time=18.5, close_time=0)
+    assert message.open_time == 18.5 and message.close_time is None
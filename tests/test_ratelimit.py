@@ -0,0 +1,86 @@
+import pytest
+from _component import load
+
+const = load("const")
+ratelimit = load("ratelimit")
+
+BURST = const.RATE_LIMIT_DEVICE_BURST
+
+
+@pytest.fixture
+def delivered():
+    return []
+
+
+@pytest.fixture
+def limiter(loop, delivered):
+    return ratelimit.ReportRateLimiter(loop, delivered.append, clock=loop.time)
+
+
+def _flood(limiter, device, count, gateway="gw"):
+    return sum(
+        limiter.submit(f"{device}-{idx}", gateway, device, (device, idx)) for idx in range(count)
+    )
+
+
+def test_token_bucket_refills_at_its_rate_up_to_the_burst():
+    bucket = ratelimit.TokenBucket(rate=10, burst=5, now=0.0)
+    bucket.tokens = 0
+    assert bucket.refill(0.2) == pytest.approx(2)
+    assert bucket.refill(10.0) == 5
+
+
+def test_device_burst_is_admitted_then_reports_are_parked(limiter, delivered):
+    assert _flood(limiter, "A1", BURST) == BURST
+    assert not limiter.submit("late", "gw", "A1", ("A1", 1))
+    assert limiter.as_dict()["pending"] == 1
+    assert delivered == []
+
+
+def test_newer_report_replaces_the_parked_one(loop, limiter, delivered):
+    _flood(limiter, "A1", BURST)
+    limiter.submit("1_ON", "gw", "A1", ("A1", "1"))
+    limiter.submit("1_OFF", "gw", "A1", ("A1", "1"))
+    loop.advance(1 / const.RATE_LIMIT_DEVICE_PER_SECOND)
+    assert delivered == ["1_OFF"]
+    assert limiter.as_dict() == {
+        "admitted": BURST,
+        "deferred": 1,
+        "coalesced": 1,
+        "dropped": 0,
+        "pending": 0,
+    }
+    assert loop.pending() == 0
+
+
+def test_reports_beyond_the_pending_table_are_dropped(monkeypatch, limiter):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_MAX_PENDING", 1)
+    _flood(limiter, "A1", BURST)
+    limiter.submit("a", "gw", "A1", ("A1", "a"))
+    limiter.submit("b", "gw", "A1", ("A1", "b"))
+    assert limiter.as_dict()["dropped"] == 1
+
+
+def test_gateway_bucket_limits_all_its_devices(limiter):
+    devices = const.RATE_LIMIT_GATEWAY_BURST // BURST
+    for idx in range(devices):
+        assert _flood(limiter, f"D{idx}", BURST) == BURST
+    assert not limiter.submit("x", "gw", "fresh", ("fresh", 1))
+    assert limiter.submit("x", "other-gw", "fresh2", ("fresh2", 1))
+
+
+def test_busy_bucket_is_not_evicted(monkeypatch, limiter):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_MAX_BUCKETS", 2)
+    _flood(limiter, "busy", BURST)
+    limiter.submit("x", "gw", "quiet", ("quiet", 1))
+    limiter.submit("y", "gw", "busy", ("busy", "y"))  # busy is used again
+    limiter.submit("z", "gw", "new", ("new", 1))  # evicts quiet, not busy
+    assert list(limiter._device_buckets) == ["busy", "new"]
+    assert not limiter.submit("w", "gw", "busy", ("busy", "w"))
+
+
+def test_cancel_drops_parked_reports(loop, limiter, delivered):
+    _flood(limiter, "A1", BURST + 1)
+    limiter.cancel()
+    loop.advance(5)
+    assert delivered == [] and limiter.as_dict()["pending"] == 0
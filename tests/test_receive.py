@@ -0,0 +1,107 @@
+import asyncio
+import os
+import socket
+import sys
+
+import pytest
+from _component import load
+
+pytest.importorskip("homeassistant")
+const = load("const")
+udp = load("udp")
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux counters")
+
+
+@pytest.fixture
+def receiver(request):
+    if request.config.pluginmanager.hasplugin("socket"):
+        # pytest-socket, pulled in by Home Assistant's test plugin, blocks sockets.
+        request.getfixturevalue("socket_enabled")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    yield sock, sender
+    sock.close()
+    sender.close()
+
+
+def test_drain_reads_at_most_one_batch_per_call(receiver):
+    sock, sender = receiver
+    ancbufsize = udp._prepare_nonblocking(sock)
+    total = const.BULK_RECEIVE_MAX_DATAGRAMS + 5
+    for idx in range(total):
+        sender.sendto(b"%d" % idx, sock.getsockname())
+
+    first, _ = udp._drain_socket(sock, ancbufsize)
+    second, _ = udp._drain_socket(sock, ancbufsize)
+    third, _ = udp._drain_socket(sock, ancbufsize)
+    assert len(first) == const.BULK_RECEIVE_MAX_DATAGRAMS
+    assert [data for data, _ in first + second] == [b"%d" % idx for idx in range(total)]
+    assert first[0][1][1] == sender.getsockname()[1]
+    assert third == []
+
+
+@linux_only
+def test_kernel_drops_are_reported(receiver):
+    sock, sender = receiver
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    ancbufsize = udp._prepare_nonblocking(sock)
+    assert ancbufsize
+    for _ in range(200):
+        sender.sendto(b"x" * 1024, sock.getsockname())
+
+    counters = udp._proc_udp_counters(os.fstat(sock.fileno()).st_ino)
+    assert counters["kernel_drops"] > 0 and counters["rx_queue"] > 0
+    while udp._drain_socket(sock, ancbufsize)[0]:
+        pass
+    # The counter rides on datagrams queued after the drops.
+    sender.sendto(b"y", sock.getsockname())
+    datagrams, kernel_drops = udp._drain_socket(sock, ancbufsize)
+    assert datagrams[0][0] == b"y"
+    assert kernel_drops == counters["kernel_drops"]
+
+
+def test_unknown_socket_has_no_proc_counters():
+    assert udp._proc_udp_counters(-1) == {}
+
+
+def test_receive_thread_survives_a_datagram_that_fails_to_parse(receiver, monkeypatch, caplog):
+    sock, sender = receiver
+
+    class Protocol:
+        def __init__(self) -> None:
+            self.received = []
+
+        def message_received(self, message, addr) -> None:
+            self.received.append(message)
+
+    def parse(data, addr):
+        if data == b"bad":
+            raise ValueError("bad datagram")
+        return udp.DeviceReportMessage.from_data(
+            "device_report", {"device_id": "A1", "payload": data.decode()}
+        )
+
+    monkeypatch.setattr(udp, "_parse_datagram", parse)
+
+    async def run():
+        protocol = Protocol()
+        thread = udp._ThreadedReceiver(asyncio.get_running_loop(), sock, protocol, "test")
+        thread.start()
+        sender.sendto(b"bad", sock.getsockname())
+        sender.sendto(b"1_ON", sock.getsockname())
+        for _ in range(200):
+            if protocol.received:
+                break
+            await asyncio.sleep(0.01)
+        alive = thread._thread.is_alive()
+        await thread.async_stop()
+        return protocol.received, thread.as_dict(), alive
+
+    received, stats, alive = asyncio.run(run())
+    assert alive
+    assert [message.payload for message in received] == ["1_ON"]
+    assert stats["invalid"] == 1
+    assert "Failed to parse UDP datagram" in caplog.text
+    assert "stopped unexpectedly" not in caplog.text
@@ -0,0 +1,141 @@
+import pytest
+from _component import load
+
+const = load("const")
+scheduler = load("scheduler")
+
+RATE = 4
+ADDR = ("192.0.2.10", const.GATEWAY_COMMAND_PORT)
+INTERACTIVE = const.PRIORITY_INTERACTIVE
+RETRY = const.PRIORITY_RETRY
+BACKGROUND = const.PRIORITY_BACKGROUND
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def pacer(loop, sent):
+    def send(bind_ip, data, addr):
+        sent.append(data)
+        return True
+
+    return scheduler.SendScheduler(loop, RATE, send, clock=loop.time)
+
+
+def _submit(pacer, data, priority=INTERACTIVE, cost=1, on_sent=None):
+    return pacer.submit("", ADDR, data, cost, priority, on_sent)
+
+
+def _exhaust(pacer):
+    for idx in range(RATE):
+        _submit(pacer, b"burst %d" % idx)
+
+
+def test_datagrams_within_the_budget_go_out_at_once(pacer, sent):
+    _exhaust(pacer)
+    assert len(sent) == RATE
+    assert pacer.as_dict()["gateways"][ADDR[0]]["queued"] == 0
+
+
+def test_queued_datagrams_are_released_as_tokens_return(loop, pacer, sent):
+    _exhaust(pacer)
+    sent.clear()
+    for name in (b"a", b"b", b"c"):
+        assert _submit(pacer, name)
+    assert sent == []
+    loop.advance(1 / RATE)
+    assert sent == [b"a"]
+    loop.advance(2 / RATE)
+    assert sent == [b"a", b"b", b"c"]
+    assert loop.pending() == 0
+
+
+def test_higher_priority_goes_first(loop, pacer, sent):
+    _exhaust(pacer)
+    sent.clear()
+    _submit(pacer, b"join", BACKGROUND)
+    _submit(pacer, b"retry", RETRY)
+    _submit(pacer, b"scene", INTERACTIVE)
+    loop.advance(3 / RATE)
+    assert sent == [b"scene", b"retry", b"join"]
+
+
+def test_identical_datagram_replaces_the_queued_one_at_the_back(loop, pacer, sent):
+    _exhaust(pacer)
+    sent.clear()
+    for command in (b"1_ON", b"1_OFF", b"1_ON"):
+        _submit(pacer, command)
+    loop.advance(3 / RATE)
+    # Sent once, after the OFF: the light ends ON.
+    assert sent == [b"1_OFF", b"1_ON"]
+    stats = pacer.as_dict()["gateways"][ADDR[0]]
+    assert stats["merged"] == 1 and stats["queued"] == 2
+
+
+def test_retransmission_keeps_the_original_priority(loop, pacer, sent):
+    _exhaust(pacer)
+    sent.clear()
+    _submit(pacer, b"cmd", INTERACTIVE)
+    _submit(pacer, b"join", BACKGROUND)
+    _submit(pacer, b"cmd", RETRY)
+    loop.advance(2 / RATE)
+    assert sent == [b"cmd", b"join"]
+
+
+def test_full_queue_drops_lower_priority_first(monkeypatch, pacer):
+    monkeypatch.setattr(scheduler, "SEND_QUEUE_MAX", 2)
+    _exhaust(pacer)
+    assert _submit(pacer, b"join", BACKGROUND)
+    assert _submit(pacer, b"a", INTERACTIVE)
+    assert _submit(pacer, b"b", INTERACTIVE)  # replaces the join
+    assert not _submit(pacer, b"c", INTERACTIVE)
+    assert not _submit(pacer, b"d", BACKGROUND)
+    assert pacer.as_dict()["gateways"][ADDR[0]]["dropped"] == 3
+
+
+def test_on_sent_runs_when_the_datagram_leaves(loop, pacer):
+    calls = []
+    _submit(pacer, b"now", on_sent=lambda: calls.append("now"))
+    assert calls == ["now"]
+    _exhaust(pacer)  # the last of these is queued
+    _submit(pacer, b"later", on_sent=lambda: calls.append("later"))
+    loop.advance(1 / RATE)
+    assert calls == ["now"]
+    loop.advance(1 / RATE)
+    assert calls == ["now", "later"]
+
+
+def test_on_sent_survives_a_merge(loop, pacer):
+    calls = []
+    _exhaust(pacer)
+    _submit(pacer, b"cmd", on_sent=lambda: calls.append("first"))
+    _submit(pacer, b"cmd", RETRY)
+    loop.advance(1 / RATE)
+    assert calls == ["first"]
+
+
+def test_multi_command_datagram_costs_one_token_per_command(loop, pacer, sent):
+    assert _submit(pacer, b"multi", cost=RATE - 1)
+    assert _submit(pacer, b"single")
+    assert _submit(pacer, b"queued")
+    assert sent == [b"multi", b"single"]
+    loop.advance(1 / RATE)
+    assert sent[-1] == b"queued"
+    # Larger than the whole budget: sent once the bucket is full again.
+    assert _submit(pacer, b"scene", cost=RATE * 10)
+    loop.advance(1 - 0.01)
+    assert sent[-1] == b"queued"
+    loop.advance(0.01)
+    assert sent[-1] == b"scene"
+
+
+def test_cancel_clears_the_queues(loop, pacer, sent):
+    _exhaust(pacer)
+    sent.clear()
+    _submit(pacer, b"a")
+    pacer.cancel()
+    loop.advance(5)
+    assert sent == []